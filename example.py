@@ -1,15 +1,15 @@
-from keev import Application, Router, Request, JSONResponse, BaseMiddleware
+from keev import Application, Router, Request, JSONResponse, BaseMiddleware, ProfilerMiddleware
 from keev.routing import RequestContext
 from keev.utils import get_logger, setup_logging
 from keev.static import StaticFiles
 from keev.docs import get_docs_routes
 from pydantic import BaseModel
 from typing import Optional, List, Callable, Awaitable
-from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean
-from sqlalchemy.orm import sessionmaker, Session, DeclarativeBase
+from sqlalchemy import create_engine, event, select, insert, bindparam, Column, Integer, String, Float, Boolean
+from sqlalchemy.orm import DeclarativeBase
 import os
 import time
-from keev.responses import Response
+from keev.responses import Response, StreamingJSONResponse
 
 # Set up logging with colors
 setup_logging()
@@ -17,8 +17,14 @@ logger = get_logger("example")
 
 # SQLAlchemy setup
 DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+@event.listens_for(engine, "connect")
+def _enable_wal(dbapi_connection, connection_record):
+    # WAL lets concurrent readers proceed while a write is in progress
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
 
 # Modern SQLAlchemy declarative base
 class Base(DeclarativeBase):
@@ -36,6 +42,12 @@ class ItemDB(Base):
 # Create tables
 Base.metadata.create_all(bind=engine)
 
+# Core statements built once; SQLAlchemy caches their compiled form, and
+# plain row tuples skip the ORM identity map and per-row model validation.
+SELECT_ITEMS = select(ItemDB.id, ItemDB.name, ItemDB.price, ItemDB.in_stock)
+SELECT_ITEM = SELECT_ITEMS.where(ItemDB.id == bindparam("item_id"))
+INSERT_ITEM = insert(ItemDB)
+
 # Pydantic model
 class Item(BaseModel):
     id: Optional[int] = None
@@ -80,14 +92,6 @@ class LoggingMiddleware(BaseMiddleware):
             logger.info(f"Completed {request.method} {request.path} - {response.status_code}")
         return response
 
-# Database dependency
-def get_db() -> Session:
-    db = SessionLocal()
-    try:
-        return db
-    finally:
-        db.close()
-
 # Create the application
 app = Application(
     debug=True,
@@ -147,13 +151,15 @@ async def home():
 @router.get("/items")
 async def list_items():
     """Get all items from the database"""
-    try:
-        db = get_db()
-        items = db.query(ItemDB).all()
-        return JSONResponse([Item.model_validate(item).model_dump() for item in items])
-    except Exception as e:
-        logger.error(f"Error listing items: {e}")
-        return JSONResponse({"error": "Failed to list items"}, status_code=500)
+    return StreamingJSONResponse(_iter_items())
+
+def _iter_items():
+    # Rows are fetched in batches and encoded as they arrive, so memory stays
+    # flat no matter how large the table is
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=1000).execute(SELECT_ITEMS)
+        for row in result.mappings():
+            yield dict(row)
 
 @router.post("/items")
 async def create_item(ctx: RequestContext, item: Item):
@@ -174,20 +180,14 @@ async def create_item(ctx: RequestContext, item: Item):
             )
         
         # Item validation is handled by Pydantic
-        db = get_db()
+        data = item.model_dump(exclude={"id"})
         try:
-            db_item = ItemDB(**item.model_dump(exclude={"id"}))
-            db.add(db_item)
-            db.commit()
-            db.refresh(db_item)
-            
-            return JSONResponse(Item.model_validate(db_item).model_dump(), status_code=201)
+            with engine.begin() as conn:
+                result = conn.execute(INSERT_ITEM, data)
+            return JSONResponse({"id": result.inserted_primary_key[0], **data}, status_code=201)
         except Exception as e:
             logger.error(f"Error creating item: {e}")
-            db.rollback()
             return JSONResponse({"error": "Failed to create item in database"}, status_code=500)
-        finally:
-            db.close()
             
     except ValueError as e:
         return JSONResponse({
@@ -204,11 +204,11 @@ async def get_item(item_id: int):
         item_id: The numeric ID of the item to retrieve
     """
     try:
-        db = get_db()
-        item = db.query(ItemDB).filter(ItemDB.id == item_id).first()
+        with engine.connect() as conn:
+            item = conn.execute(SELECT_ITEM, {"item_id": item_id}).mappings().first()
         if not item:
             return JSONResponse({"error": "Item not found"}, status_code=404)
-        return JSONResponse(Item.model_validate(item).model_dump())
+        return JSONResponse(dict(item))
     except Exception as e:
         logger.error(f"Error getting item {item_id}: {e}")
         return JSONResponse({"error": "Failed to get item"}, status_code=500)
@@ -232,6 +232,8 @@ router.include_router(docs_router)
 # Add middleware
 app.add_middleware(LoggingMiddleware())
 app.add_middleware(TimingMiddleware())
+# Run with KEEV_PROFILE=1 and append ?profile=1 to a URL to get a pyinstrument report
+app.add_middleware(ProfilerMiddleware())
 
 # Log registered routes once
 logger.info("Registered routes:")
@@ -3,8 +3,8 @@ __version__ = "0.1.0"
 from .application import Application
 from .routing import Router, Depends, RateLimit, RequestContext, RouteMetadata
 from .requests import Request
-from .responses import Response, JSONResponse, HTMLResponse
-from .middleware import BaseMiddleware, CORSMiddleware
+from .responses import Response, JSONResponse, HTMLResponse, MsgPackResponse
+from .middleware import BaseMiddleware, CORSMiddleware, ProfilerMiddleware
 from .static import StaticFiles
 from .exceptions import (
     HTTPException,
@@ -44,6 +44,7 @@ __all__ = [
     "Response",
     "JSONResponse",
     "HTMLResponse",
+    "MsgPackResponse",
     
     # Routing
     "Depends",
@@ -52,6 +53,7 @@ __all__ = [
     # Middleware
     "BaseMiddleware",
     "CORSMiddleware",
+    "ProfilerMiddleware",
     
     # Static Files
     "StaticFiles",
@@ -1,9 +1,9 @@
-from typing import Awaitable, Callable, Dict, List, Optional, Any
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Union
 from contextlib import asynccontextmanager
 from keev.middleware import BaseMiddleware
 from keev.requests import Request
 from keev.responses import Response, JSONResponse
-from keev.utils import get_logger
+from keev.utils import get_logger, json_dumps
 from keev.plugins import PluginManager, Plugin
 from keev.exceptions import HTTPException, InternalServerError
 import asyncio
@@ -11,10 +11,20 @@ import traceback
 
 logger = get_logger("keev.app")
 
+# Non-debug 500 body; only the path varies, so it is spliced in as a JSON string
+_ERROR_BODY_PREFIX = b'{"error":"Internal Server Error","status_code":500,"path":'
+_ERROR_BODY_SUFFIX = b'}'
+
+Middleware = Callable[[Request, Callable[[Request], Awaitable[Response]]], Awaitable[Response]]
+
 class Application:
-    def __init__(self, debug: bool = False, title: str = "Keev API", version: str = "1.0.0", enable_plugins: bool = False):
-        self.middleware: List[BaseMiddleware] = []
-        self.router = None
+    def __init__(self, debug: bool = False, title: str = "Keev API", version: str = "1.0.0", enable_plugins: bool = False,
+                 plugin_strategy: str = "sync"):
+        self.middleware: List[Middleware] = []
+        self._router = None
+        self._compiled_chain: Optional[Callable[[Request], Awaitable[Response]]] = None
+        # Middleware count the compiled chain was built for
+        self._chain_depth = 0
         self.debug = debug
         self.title = title
         self.version = version
@@ -22,11 +32,50 @@ class Application:
         self._lifespan_manager = None
         self._startup_complete = False
         self._shutdown_complete = False
-        self._startup_handlers = []
-        self._shutdown_handlers = []
-        self.plugin_manager = PluginManager() if enable_plugins else None
+        # (handler, is_coroutine) pairs, classified once in on_event
+        self._startup_handlers: List[tuple] = []
+        self._shutdown_handlers: List[tuple] = []
+        self.plugin_manager = PluginManager(plugin_strategy) if enable_plugins else None
+        if self.plugin_manager is not None:
+            self.plugin_manager.debug = debug
         self._plugins_enabled = enable_plugins
-        
+        self._rebuild_dispatch()
+
+    @property
+    def router(self):
+        return self._router
+
+    @router.setter
+    def router(self, router) -> None:
+        self._router = router
+        self._compiled_chain = None
+
+    def _build_chain(self) -> Callable[[Request], Awaitable[Response]]:
+        """Fold the middleware stack around the router into a single callable"""
+        def make(middleware, call_next):
+            async def call(request: Request) -> Response:
+                return await middleware(request, call_next)
+            return call
+
+        chain = self._router.handle_request
+        for middleware in reversed(self.middleware):
+            chain = make(middleware, chain)
+        self._compiled_chain = chain
+        self._chain_depth = len(self.middleware)
+        return chain
+
+    def _rebuild_dispatch(self) -> None:
+        """Select the HTTP pipeline for the current middleware/plugin setup"""
+        if self.middleware or (self._plugins_enabled and self.plugin_manager.plugins):
+            self._handle_http = self._handle_http_full
+        else:
+            self._handle_http = self._handle_http_fast
+        self._scope_handlers = {
+            "lifespan": self._handle_lifespan,
+            "http": self._handle_http,
+            "websocket": self._handle_websocket,
+        }
+
     @asynccontextmanager
     async def lifespan(self):
         try:
@@ -43,9 +92,9 @@ class Application:
             logger.info("Starting up application")
             
             # Run startup handlers
-            for handler in self._startup_handlers:
+            for handler, is_coroutine in self._startup_handlers:
                 try:
-                    if asyncio.iscoroutinefunction(handler):
+                    if is_coroutine:
                         await handler()
                     else:
                         handler()
@@ -83,9 +132,9 @@ class Application:
             logger.info("Shutting down application")
             
             # Run shutdown handlers
-            for handler in self._shutdown_handlers:
+            for handler, is_coroutine in self._shutdown_handlers:
                 try:
-                    if asyncio.iscoroutinefunction(handler):
+                    if is_coroutine:
                         await handler()
                     else:
                         handler()
@@ -117,25 +166,17 @@ class Application:
         """Register a custom plugin"""
         if not self._plugins_enabled:
             raise RuntimeError("Plugins are disabled. Enable plugins by setting enable_plugins=True in Application constructor.")
-        self.plugin_manager.register(plugin) 
+        self.plugin_manager.register(plugin)
+        self._rebuild_dispatch()
 
     async def __call__(self, scope: Dict, receive: Callable, send: Callable) -> None:
-        if not self.router:
+        if self._router is None:
             raise RuntimeError("No router configured. Set app.router before running the application.")
 
-        if scope["type"] == "lifespan":
-            await self._handle_lifespan(scope, receive, send)
-            return
-            
-        if scope["type"] == "http":
-            await self._handle_http(scope, receive, send)
-            return
-            
-        if scope["type"] == "websocket":
-            await self._handle_websocket(scope, receive, send)
-            return
-            
-        raise ValueError(f"Unknown scope type: {scope['type']}")
+        handler = self._scope_handlers.get(scope["type"])
+        if handler is None:
+            raise ValueError(f"Unknown scope type: {scope['type']}")
+        await handler(scope, receive, send)
 
     async def _handle_lifespan(self, scope: Dict, receive: Callable, send: Callable) -> None:
         while True:
@@ -155,7 +196,25 @@ class Application:
                     await send({"type": "lifespan.shutdown.failed", "message": str(e)})
                 return
 
-    async def _handle_http(self, scope: Dict, receive: Callable, send: Callable) -> None:
+    async def _handle_http_fast(self, scope: Dict, receive: Callable, send: Callable) -> None:
+        """HTTP pipeline with no middleware or plugins: straight to the router"""
+        # Middleware appended to ``self.middleware`` or plugins registered on
+        # ``plugin_manager`` directly bypass _rebuild_dispatch; catch them here
+        if self.middleware or (self._plugins_enabled and self.plugin_manager.plugins):
+            self._rebuild_dispatch()
+            await self._handle_http_full(scope, receive, send)
+            return
+        try:
+            request = Request(scope, receive)
+            try:
+                response = await self.router.handle_request(request)
+            except HTTPException as e:
+                response = self._http_exception_response(e)
+            await response(scope, receive, send)
+        except Exception as e:
+            await self._send_error(e, scope, receive, send)
+
+    async def _handle_http_full(self, scope: Dict, receive: Callable, send: Callable) -> None:
         try:
             request = Request(scope, receive)
             
@@ -163,7 +222,10 @@ class Application:
             if self._plugins_enabled:
                 await self.plugin_manager.run_pre_request(request)
             
-            response = await self.handle_request(request)
+            try:
+                response = await self._dispatch(request)
+            except HTTPException as e:
+                response = self._http_exception_response(e)
             
             # Run plugin post-request hooks if enabled
             if self._plugins_enabled:
@@ -172,18 +234,35 @@ class Application:
             await response(scope, receive, send)
             
         except Exception as e:
-            logger.error(f"Error handling request: {e}")
-            if self.debug:
-                traceback.print_exc()
+            await self._send_error(e, scope, receive, send)
+
+    async def _send_error(self, exc: Exception, scope: Dict, receive: Callable, send: Callable) -> None:
+        logger.error(f"Error handling request: {exc}")
+        if self.debug:
+            traceback.print_exc()
             error_response = JSONResponse(
                 {
-                    "error": str(e) if self.debug else "Internal Server Error",
+                    "error": str(exc),
                     "status_code": 500,
                     "path": scope.get("path", "")
                 },
                 status_code=500
             )
-            await error_response(scope, receive, send)
+        else:
+            error_response = Response(
+                _ERROR_BODY_PREFIX + json_dumps(scope.get("path", "")) + _ERROR_BODY_SUFFIX,
+                status_code=500,
+                media_type="application/json"
+            )
+        await error_response(scope, receive, send)
+
+    @staticmethod
+    def _http_exception_response(exc: HTTPException) -> Response:
+        return JSONResponse(
+            {"error": exc.detail, "status_code": exc.status_code},
+            status_code=exc.status_code,
+            headers=exc.headers
+        )
 
     async def _handle_websocket(self, scope: Dict, receive: Callable, send: Callable) -> None:
         try:
@@ -197,58 +276,52 @@ class Application:
             if self.debug:
                 traceback.print_exc()
 
+    async def _dispatch(self, request: Request) -> Response:
+        """Run the request through the middleware chain and router, unguarded"""
+        # The first middleware added is the outermost; the router runs innermost
+        chain = self._compiled_chain
+        if chain is None or self._chain_depth != len(self.middleware):
+            chain = self._build_chain()
+        return await chain(request)
+
     async def handle_request(self, request: Request) -> Response:
         try:
-            # Get base response from router
-            response = await self.router.handle_request(request)
-
-            # Apply middleware in reverse order
-            for middleware in reversed(self.middleware):
-                try:
-                    async def call_next(req: Request) -> Response:
-                        return response
-                    response = await middleware(request, call_next)
-                except Exception as e:
-                    logger.error(f"Middleware error: {e}")
-                    if self.debug:
-                        traceback.print_exc()
-                    raise
-
-            return response
-                
+            return await self._dispatch(request)
         except Exception as e:
             if isinstance(e, HTTPException):
-                return JSONResponse(
-                    {"error": e.detail, "status_code": e.status_code},
-                    status_code=e.status_code,
-                    headers=e.headers
-                )
+                return self._http_exception_response(e)
             raise InternalServerError(str(e) if self.debug else None) from e
 
-    def add_middleware(self, middleware: BaseMiddleware) -> None:
-        """Add middleware to the application"""
-        logger.debug(f"Adding middleware: {middleware.__class__.__name__}")
-        if not isinstance(middleware, BaseMiddleware):
-            raise TypeError("Middleware must be an instance of BaseMiddleware")
+    def add_middleware(self, middleware: Union[BaseMiddleware, Middleware]) -> None:
+        """Add middleware to the application
+
+        Accepts a BaseMiddleware instance or any ``async (request, call_next)``
+        callable.
+        """
+        if not callable(middleware):
+            raise TypeError("Middleware must be callable as middleware(request, call_next)")
         self.middleware.append(middleware)
-        logger.debug(f"Added middleware: {middleware.__class__.__name__}")
+        self._compiled_chain = None
+        self._rebuild_dispatch()
+        logger.debug(f"Added middleware: {getattr(middleware, '__name__', middleware.__class__.__name__)}")
 
     def mount(self, path: str, app: 'Application') -> None:
         """Mount another application at the specified path"""
-        if not path.startswith("/"):
-            path = f"/{path}"
-        if not self.router:
+        path = path if path[:1] == "/" else "/" + path
+        if self._router is None:
             raise RuntimeError("No router configured. Set app.router before mounting applications.")
         self.router.include_router(app.router, prefix=path)
+        self._compiled_chain = None
         logger.debug(f"Mounted application at path: {path}")
 
     def on_event(self, event_type: str):
         """Decorator for registering event handlers"""
         def decorator(func: Callable):
+            entry = (func, asyncio.iscoroutinefunction(func))
             if event_type == "startup":
-                self._startup_handlers.append(func)
+                self._startup_handlers.append(entry)
             elif event_type == "shutdown":
-                self._shutdown_handlers.append(func)
+                self._shutdown_handlers.append(entry)
             else:
                 raise ValueError(f"Unknown event type: {event_type}")
             return func
@@ -1,12 +1,70 @@
 from typing import Any, Dict, List, Optional, Type
 from pydantic import BaseModel
-import json
 from dataclasses import dataclass, field
-from keev.responses import HTMLResponse
+from keev.responses import HTMLResponse, Response
 from keev.routing import Route, Router
+from keev.utils import json_dumps
 import inspect
 import re
 
+# Matches typed path parameters ("{item_id:int}") so they can be rewritten
+# to the plain OpenAPI form ("{item_id}")
+_PARAM_RE = re.compile(r"\{([^}:]+):[^}]+\}")
+
+# Docs page skeletons, split around the title and the spec so pages are
+# assembled by plain concatenation
+_DOC_HEAD = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>"""
+
+_SWAGGER_PREFIX = """ - API Documentation</title>
+    <meta charset="utf-8"/>
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+    <link rel="stylesheet" type="text/css" href="https://cdn.jsdelivr.net/npm/swagger-ui-dist@5/swagger-ui.css" />
+</head>
+<body>
+    <div id="swagger-ui"></div>
+    <script src="https://cdn.jsdelivr.net/npm/swagger-ui-dist@5/swagger-ui-bundle.js"></script>
+    <script>
+        window.onload = () => {
+            window.ui = SwaggerUIBundle({
+                spec: """
+
+_SWAGGER_SUFFIX = """,
+                dom_id: '#swagger-ui',
+                deepLinking: true,
+                presets: [
+                    SwaggerUIBundle.presets.apis,
+                    SwaggerUIBundle.SwaggerUIStandalonePreset
+                ],
+            });
+        };
+    </script>
+</body>
+</html>
+"""
+
+_REDOC_PREFIX = """ - API Documentation</title>
+    <meta charset="utf-8"/>
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+    <link href="https://fonts.googleapis.com/css?family=Montserrat:300,400,700|Roboto:300,400,700" rel="stylesheet">
+</head>
+<body>
+    <div id="redoc"></div>
+    <script src="https://cdn.jsdelivr.net/npm/redoc@next/bundles/redoc.standalone.js"></script>
+    <script>
+        Redoc.init("""
+
+_REDOC_SUFFIX = """, {
+            scrollYOffset: 50
+        }, document.getElementById('redoc'));
+    </script>
+</body>
+</html>
+"""
+
 @dataclass
 class APIEndpoint:
     path: str
@@ -23,19 +81,25 @@ class APIDocumentation:
         self.title = title
         self.version = version
         self.endpoints: List[APIEndpoint] = []
+        # The spec only changes when routers are added, so it and everything
+        # rendered from it are cached until then
+        self._spec_cache: Optional[Dict[str, Any]] = None
+        self._spec_json: Optional[str] = None
+        self._swagger_html: Optional[str] = None
+        self._redoc_html: Optional[str] = None
 
     def add_router(self, router: Router) -> None:
         """Add routes from a router to the documentation"""
+        self._spec_cache = self._spec_json = self._swagger_html = self._redoc_html = None
         for route in router.routes:
             if not route.metadata:
                 continue
 
             parameters = []
-            openapi_path = route.path
+            openapi_path = _PARAM_RE.sub(r"{\1}", route.path)
             
             if route.param_types:
                 for name, type_ in route.param_types.items():
-                    openapi_path = re.sub(f"{{{name}:[^}}]+}}", f"{{{name}}}", openapi_path)
                     parameters.append({
                         "name": name,
                         "in": "path",
@@ -75,6 +139,9 @@ class APIDocumentation:
 
     def _generate_openapi_spec(self) -> Dict[str, Any]:
         """Generate OpenAPI specification"""
+        if self._spec_cache is not None:
+            return self._spec_cache
+
         paths: Dict[str, Dict[str, Any]] = {}
         schemas: Dict[str, Any] = {}
 
@@ -134,7 +201,7 @@ class APIDocumentation:
 
                 paths[endpoint.path][method] = operation
 
-        return {
+        self._spec_cache = {
             "openapi": "3.0.2",
             "info": {
                 "title": self.title,
@@ -145,62 +212,29 @@ class APIDocumentation:
                 "schemas": schemas
             }
         }
+        return self._spec_cache
+
+    def get_openapi_json(self) -> str:
+        """Get the OpenAPI specification encoded as JSON"""
+        if self._spec_json is None:
+            self._spec_json = json_dumps(self._generate_openapi_spec()).decode()
+        return self._spec_json
 
     def get_swagger_ui(self) -> str:
         """Generate Swagger UI HTML"""
-        spec = self._generate_openapi_spec()
-        return f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>{self.title} - API Documentation</title>
-    <meta charset="utf-8"/>
-    <meta name="viewport" content="width=device-width, initial-scale=1">
-    <link rel="stylesheet" type="text/css" href="https://cdn.jsdelivr.net/npm/swagger-ui-dist@5/swagger-ui.css" />
-</head>
-<body>
-    <div id="swagger-ui"></div>
-    <script src="https://cdn.jsdelivr.net/npm/swagger-ui-dist@5/swagger-ui-bundle.js"></script>
-    <script>
-        window.onload = () => {{
-            window.ui = SwaggerUIBundle({{
-                spec: {json.dumps(spec)},
-                dom_id: '#swagger-ui',
-                deepLinking: true,
-                presets: [
-                    SwaggerUIBundle.presets.apis,
-                    SwaggerUIBundle.SwaggerUIStandalonePreset
-                ],
-            }});
-        }};
-    </script>
-</body>
-</html>
-"""
+        if self._swagger_html is None:
+            self._swagger_html = (
+                _DOC_HEAD + self.title + _SWAGGER_PREFIX + self.get_openapi_json() + _SWAGGER_SUFFIX
+            )
+        return self._swagger_html
 
     def get_redoc(self) -> str:
         """Generate ReDoc HTML"""
-        spec = self._generate_openapi_spec()
-        return f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>{self.title} - API Documentation</title>
-    <meta charset="utf-8"/>
-    <meta name="viewport" content="width=device-width, initial-scale=1">
-    <link href="https://fonts.googleapis.com/css?family=Montserrat:300,400,700|Roboto:300,400,700" rel="stylesheet">
-</head>
-<body>
-    <div id="redoc"></div>
-    <script src="https://cdn.jsdelivr.net/npm/redoc@next/bundles/redoc.standalone.js"></script>
-    <script>
-        Redoc.init({json.dumps(spec)}, {{
-            scrollYOffset: 50
-        }}, document.getElementById('redoc'));
-    </script>
-</body>
-</html>
-"""
+        if self._redoc_html is None:
+            self._redoc_html = (
+                _DOC_HEAD + self.title + _REDOC_PREFIX + self.get_openapi_json() + _REDOC_SUFFIX
+            )
+        return self._redoc_html
 
 def get_docs_routes(app: Any) -> Router:
     """Create routes for API documentation"""
@@ -223,6 +257,6 @@ def get_docs_routes(app: Any) -> Router:
     @docs_router.get("/openapi.json")
     async def openapi_spec(request):
         """OpenAPI specification"""
-        return docs._generate_openapi_spec()
+        return Response(docs.get_openapi_json(), media_type="application/json")
 
     return docs_router
\ No newline at end of file
@@ -1,9 +1,14 @@
-from typing import Callable, Awaitable, List
+from typing import Callable, Awaitable, List, Optional
 from keev.requests import Request
-from keev.responses import Response
+from keev.responses import Response, HTMLResponse
+import os
 
 class BaseMiddleware:
-    """Base class for middleware"""
+    """Base class for middleware
+
+    Subclassing is optional: Application.add_middleware also accepts a plain
+    ``async def middleware(request, call_next)`` function.
+    """
     
     async def __call__(
         self,
@@ -18,34 +23,83 @@ class CORSMiddleware(BaseMiddleware):
     
     def __init__(self, allow_origins: List[str] = None):
         self.allow_origins = allow_origins or ["*"]
+        self._allow_any = "*" in self.allow_origins
+        self._allow_set = frozenset(self.allow_origins)
+        self._preflight_headers = {
+            "access-control-allow-methods": "GET, POST, PUT, DELETE, PATCH, OPTIONS",
+            "access-control-allow-headers": "Content-Type, Authorization",
+            "access-control-max-age": "3600",
+        }
 
     async def __call__(
         self,
         request: Request,
         call_next: Callable[[Request], Awaitable[Response]]
     ) -> Response:
-        response = await call_next(request)
-        
-        # Get origin from request
-        origin = next(
-            (v.decode("latin1") for k, v in request.scope["headers"] 
-             if k.decode("latin1").lower() == "origin"),
-            None
-        )
-        
-        # Handle preflight requests
+        # Get origin from request; ASGI servers send lowercased header names
+        origin = None
+        requested_method = False
+        for key, value in request.scope["headers"]:
+            if key == b"origin":
+                origin = value.decode("latin1")
+            elif key == b"access-control-request-method":
+                requested_method = True
+
         if request.method == "OPTIONS":
-            response.add_header("access-control-allow-origin", "*" if "*" in self.allow_origins else origin or "")
-            response.add_header("access-control-allow-methods", "GET, POST, PUT, DELETE, PATCH, OPTIONS")
-            response.add_header("access-control-allow-headers", "Content-Type, Authorization")
-            response.add_header("access-control-max-age", "3600")
-            return response
-
-        # Handle regular requests
-        if "*" in self.allow_origins:
+            if origin is not None and requested_method:
+                # A real preflight: answered here, it never reaches the router
+                response = Response(b"", status_code=204, headers=self._preflight_headers)
+            else:
+                # Any other OPTIONS request goes to the application's own handler
+                response = await call_next(request)
+                for key, value in self._preflight_headers.items():
+                    response.add_header(key, value)
+        else:
+            response = await call_next(request)
+
+        if self._allow_any:
             response.add_header("access-control-allow-origin", "*")
-        elif origin and origin in self.allow_origins:
+        elif origin and origin in self._allow_set:
             response.add_header("access-control-allow-origin", origin)
             response.add_header("vary", "Origin")
 
-        return response
\ No newline at end of file
+        return response
+
+class ProfilerMiddleware(BaseMiddleware):
+    """Profile single requests with pyinstrument
+
+    Disabled unless ``enabled=True`` or ``KEEV_PROFILE=1`` is set. When enabled,
+    requests carrying a ``profile`` query parameter (e.g. ``?profile=1``) are
+    sampled and answered with the pyinstrument HTML report instead of the
+    regular response. pyinstrument comes with the ``profile`` extra:
+    ``pip install keev[profile]``.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, interval: float = 0.001):
+        if enabled is None:
+            enabled = os.environ.get("KEEV_PROFILE") == "1"
+        self.enabled = enabled
+        self.interval = interval
+        self._profiler_cls = None
+        if enabled:
+            try:
+                from pyinstrument import Profiler
+            except ImportError as e:
+                raise ImportError("ProfilerMiddleware requires pyinstrument: pip install keev[profile]") from e
+            self._profiler_cls = Profiler
+
+    async def __call__(
+        self,
+        request: Request,
+        call_next: Callable[[Request], Awaitable[Response]]
+    ) -> Response:
+        if not self.enabled or "profile" not in request.query_params:
+            return await call_next(request)
+
+        profiler = self._profiler_cls(interval=self.interval, async_mode="enabled")
+        profiler.start()
+        try:
+            await call_next(request)
+        finally:
+            profiler.stop()
+        return HTMLResponse(profiler.output_html())
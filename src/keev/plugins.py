@@ -1,11 +1,12 @@
-from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
+from typing import Any, Dict, List, Optional, Protocol, Tuple, runtime_checkable
 from keev.requests import Request
 from keev.responses import Response
 from keev.utils import get_logger
 from keev.exceptions import PluginError
+import asyncio
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
-import traceback
 
 logger = get_logger("keev.plugins")
 
@@ -29,69 +30,153 @@ class Plugin(Protocol):
         """Called during application shutdown"""
         ...
 
+_PLUGIN_HOOKS = ("pre_request", "post_request", "on_startup", "on_shutdown")
+
+def _is_plugin(obj: Any) -> bool:
+    """Check for the Plugin hooks directly instead of a runtime Protocol isinstance"""
+    for name in _PLUGIN_HOOKS:
+        if not callable(getattr(obj, name, None)):
+            return False
+    return True
+
 class PluginManager:
-    def __init__(self):
+    """Runs plugin hooks
+
+    With ``strategy="sync"`` (the default) hooks run one after another in
+    registration order. With ``strategy="parallel"`` the independent hooks
+    (startup, shutdown and post_request) are awaited together, so slow I/O in
+    one plugin does not delay the others; errors are still logged per plugin,
+    but plugins can no longer rely on each other's side effects. pre_request
+    always runs sequentially since it may prepare state for the handler.
+    """
+
+    STRATEGIES = ("sync", "parallel")
+
+    def __init__(self, strategy: str = "sync"):
+        if strategy not in self.STRATEGIES:
+            raise PluginError(f"Unknown plugin strategy: {strategy}")
+        self.strategy = strategy
+        self.debug = False  # Set by Application; include tracebacks in plugin error logs
         self.plugins: List[Plugin] = []
+        # (plugin name, bound hook) pairs rebuilt on register, so the
+        # per-request loops skip attribute lookups
+        self._pre_hooks: tuple = ()
+        self._post_hooks: tuple = ()
+        self._startup_hooks: tuple = ()
+        self._shutdown_hooks: tuple = ()
 
     def register(self, plugin: Plugin) -> None:
         """Register a new plugin"""
-        if not isinstance(plugin, Plugin):
+        if not _is_plugin(plugin):
             raise PluginError(f"Plugin must implement Plugin protocol: {plugin}")
         self.plugins.append(plugin)
-        logger.info(f"Registered plugin: {plugin.__class__.__name__}")
+        name = plugin.__class__.__name__
+        self._pre_hooks += ((name, plugin.pre_request),)
+        self._post_hooks += ((name, plugin.post_request),)
+        self._startup_hooks += ((name, plugin.on_startup),)
+        self._shutdown_hooks += ((name, plugin.on_shutdown),)
+        logger.info(f"Registered plugin: {name}")
 
     async def run_pre_request(self, request: Request) -> None:
         """Run all pre-request plugin hooks"""
-        for plugin in self.plugins:
+        if not self._pre_hooks:
+            return
+        for name, hook in self._pre_hooks:
             try:
-                await plugin.pre_request(request)
+                await hook(request)
             except Exception as e:
-                logger.error(f"Plugin {plugin.__class__.__name__} pre_request error: {e}")
-                traceback.print_exc()
+                self._log_error(name, "pre_request", e)
 
     async def run_post_request(self, request: Request, response: Response) -> None:
         """Run all post-request plugin hooks"""
-        for plugin in self.plugins:
+        if not self._post_hooks:
+            return
+        if self.strategy == "parallel":
+            await self._gather(
+                [(name, hook(request, response)) for name, hook in self._post_hooks], "post_request"
+            )
+            return
+        for name, hook in self._post_hooks:
             try:
-                await plugin.post_request(request, response)
+                await hook(request, response)
             except Exception as e:
-                logger.error(f"Plugin {plugin.__class__.__name__} post_request error: {e}")
-                traceback.print_exc()
+                self._log_error(name, "post_request", e)
 
     async def startup(self) -> None:
         """Run all plugin startup hooks"""
-        for plugin in self.plugins:
+        if self.strategy == "parallel":
+            await self._gather([(name, hook()) for name, hook in self._startup_hooks], "startup")
+            return
+        for name, hook in self._startup_hooks:
             try:
-                await plugin.on_startup()
+                await hook()
             except Exception as e:
-                logger.error(f"Plugin {plugin.__class__.__name__} startup error: {e}")
-                traceback.print_exc()
+                self._log_error(name, "startup", e)
 
     async def shutdown(self) -> None:
         """Run all plugin shutdown hooks"""
-        for plugin in self.plugins:
+        if self.strategy == "parallel":
+            await self._gather([(name, hook()) for name, hook in self._shutdown_hooks], "shutdown")
+            return
+        for name, hook in self._shutdown_hooks:
             try:
-                await plugin.on_shutdown()
+                await hook()
             except Exception as e:
-                logger.error(f"Plugin {plugin.__class__.__name__} shutdown error: {e}")
-                traceback.print_exc()
+                self._log_error(name, "shutdown", e)
+
+    def _log_error(self, name: str, stage: str, exc: BaseException) -> None:
+        # The traceback is only attached in debug mode, and formatting is left
+        # to the logging handlers, which skip it entirely if nothing is emitted
+        logger.error("Plugin %s %s error: %s", name, stage, exc, exc_info=exc if self.debug else None)
+
+    async def _gather(self, calls, stage: str) -> None:
+        """Await (name, coroutine) pairs concurrently and log each failure"""
+        results = await asyncio.gather(*(coro for _, coro in calls), return_exceptions=True)
+        for (name, _), result in zip(calls, results):
+            if isinstance(result, Exception):
+                self._log_error(name, stage, result)
 
 # Built-in plugins
 class MetricsPlugin(Plugin):
     def __init__(self):
         self.request_count = 0
-        self.request_times: Dict[str, List[float]] = {}
+        # Path -> [count, sum, sum of squares, min, max] of durations in integer
+        # nanoseconds; constant memory per path
+        self.request_stats: Dict[str, List[int]] = {}
 
     async def pre_request(self, request: Request) -> None:
-        request.state.start_time = time.time()
+        request.state.start_time = time.perf_counter_ns()
         self.request_count += 1
 
     async def post_request(self, request: Request, response: Response) -> None:
-        duration = time.time() - request.state.start_time
-        path = request.path
-        if path not in self.request_times:
-            self.request_times[path] = []
-        self.request_times[path].append(duration)
+        duration = time.perf_counter_ns() - request.state.start_time
+        stats = self.request_stats.get(request.path)
+        if stats is None:
+            self.request_stats[request.path] = [1, duration, duration * duration, duration, duration]
+            return
+        stats[0] += 1
+        stats[1] += duration
+        stats[2] += duration * duration
+        if duration < stats[3]:
+            stats[3] = duration
+        if duration > stats[4]:
+            stats[4] = duration
+
+    def get_stats(self, path: str) -> Optional[Dict[str, float]]:
+        """Summarize request durations (in seconds) recorded for a path"""
+        stats = self.request_stats.get(path)
+        if stats is None:
+            return None
+        count, total, total_sq, minimum, maximum = stats
+        # Exact integer variance, converted to seconds only at the end
+        variance = (total_sq * count - total * total) / (count * count)
+        return {
+            "count": count,
+            "mean": total / count / 1e9,
+            "std_dev": variance ** 0.5 / 1e9,
+            "min": minimum / 1e9,
+            "max": maximum / 1e9,
+        }
 
     async def on_startup(self) -> None:
         logger.info("Metrics plugin started")
@@ -107,48 +192,62 @@ class SecurityPlugin(Plugin):
         self.allowed_hosts = allowed_hosts or ["*"]
         self.max_content_length = max_content_length
         self.secure_headers = secure_headers
+        self._allow_any_host = "*" in self.allowed_hosts
+        self._allowed_hosts = frozenset(self.allowed_hosts)
+        # Built once and shared by every response, already in the lowercased
+        # bytes form responses store their headers in
+        self._secure_headers = {
+            b"x-content-type-options": b"nosniff",
+            b"x-frame-options": b"DENY",
+            b"x-xss-protection": b"1; mode=block",
+            b"strict-transport-security": b"max-age=31536000; includeSubDomains",
+            b"content-security-policy": b"default-src 'self'"
+        }
 
     async def pre_request(self, request: Request) -> None:
         # Host validation
         host = request.headers.get("host", "")
-        if "*" not in self.allowed_hosts and host not in self.allowed_hosts:
+        if not self._allow_any_host and host not in self._allowed_hosts:
             raise PluginError(f"Host not allowed: {host}")
 
         # Content length validation
-        content_length = int(request.headers.get("content-length", 0))
+        try:
+            content_length = int(request.headers.get("content-length", 0))
+        except ValueError:
+            raise PluginError("Invalid Content-Length header")
         if content_length > self.max_content_length:
             raise PluginError("Content too large")
 
     async def post_request(self, request: Request, response: Response) -> None:
         if self.secure_headers:
-            response.headers.update({
-                "X-Content-Type-Options": "nosniff",
-                "X-Frame-Options": "DENY",
-                "X-XSS-Protection": "1; mode=block",
-                "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
-                "Content-Security-Policy": "default-src 'self'"
-            })
+            response.headers.update_encoded(self._secure_headers)
 
 class CachePlugin(Plugin):
     def __init__(self, max_size: int = 1000):
-        self.cache: Dict[str, Any] = {}
+        # Ordered by recency of use; no lock needed, hooks run on one event loop
+        self.cache: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
         self.max_size = max_size
 
-    def _get_cache_key(self, request: Request) -> str:
-        return f"{request.method}:{request.path}"
+    def _get_cache_key(self, request: Request) -> Tuple[str, str]:
+        # A tuple hashes its existing members without building a new string
+        return (request.method, request.path)
 
     async def pre_request(self, request: Request) -> None:
         if request.method == "GET":
             key = self._get_cache_key(request)
-            if key in self.cache:
-                request.state.cached_response = self.cache[key]
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache.move_to_end(key)
+                request.state.cached_response = cached
 
     async def post_request(self, request: Request, response: Response) -> None:
         if request.method == "GET" and response.status_code == 200:
             key = self._get_cache_key(request)
-            if len(self.cache) >= self.max_size:
-                # Simple LRU: remove first item
-                self.cache.pop(next(iter(self.cache)))
+            if key in self.cache:
+                self.cache.move_to_end(key)
+            elif len(self.cache) >= self.max_size:
+                # Evict the least recently used entry
+                self.cache.popitem(last=False)
             self.cache[key] = response
 
     async def on_startup(self) -> None:
@@ -1,41 +1,160 @@
-from typing import Callable, Dict, List, Optional, Union
-from urllib.parse import parse_qs
+from collections.abc import Mapping
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, ItemsView, Iterator, List, Optional, Tuple, Union
+from urllib.parse import unquote_plus
+from keev.utils import json_loads, msgpack_loads
+
+class RequestHeaders(Mapping):
+    """Case-insensitive, read-only view over the raw ASGI header list
+
+    The first lookup scans the raw pairs and decodes only the match; any
+    later lookup or iteration builds the full decoded dict once and reuses it.
+    """
+    __slots__ = ("_raw", "_dict", "_scanned")
+
+    def __init__(self, raw: List[Tuple[bytes, bytes]]):
+        self._raw = raw
+        self._dict: Optional[Dict[str, str]] = None
+        self._scanned = False
+
+    def __getitem__(self, key: str) -> str:
+        headers = self._dict
+        if headers is None:
+            if not self._scanned:
+                # Most requests read one header, if any; a scan is cheaper
+                # than decoding them all
+                self._scanned = True
+                name = key.lower().encode("latin-1")
+                # Scan from the end so repeated headers resolve like the dict does
+                for k, v in reversed(self._raw):
+                    if k == name or k.lower() == name:
+                        return v.decode("latin-1")
+                raise KeyError(key)
+            headers = self._as_dict()
+        return headers[key.lower()]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def _as_dict(self) -> Dict[str, str]:
+        if self._dict is None:
+            headers = {}
+            for key, value in self._raw:
+                # Servers nearly always send lowercase names already; the
+                # check is cheaper than building a lowered copy of each one
+                if not key.islower():
+                    key = key.lower()
+                headers[key.decode("latin-1")] = value.decode("latin-1")
+            self._dict = headers
+        return self._dict
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._as_dict())
+
+    def __len__(self) -> int:
+        return len(self._as_dict())
+
+    def items(self) -> ItemsView[str, str]:
+        return self._as_dict().items()
+
+    def __repr__(self) -> str:
+        return f"RequestHeaders({self._as_dict()!r})"
+
+def _parse_query(query_string: bytes) -> Dict[str, List[str]]:
+    """Parse a raw query string like ``urllib.parse.parse_qs``
+
+    Pairs without a value are dropped, as parse_qs does by default, and
+    unquoting is skipped for the (common) pairs that need none. The string
+    is decoded in one go, so each pair costs only C-level str splits.
+    """
+    params: Dict[str, List[str]] = {}
+    for pair in query_string.decode("latin-1").split("&"):
+        name, _, value = pair.partition("=")
+        if not value:
+            continue
+        if "%" in pair or "+" in pair:
+            name = unquote_plus(name)
+            value = unquote_plus(value)
+        values = params.get(name)
+        if values is None:
+            params[name] = [value]
+        else:
+            values.append(value)
+    return params
+
+# Marks a request whose body hasn't been parsed as JSON yet (null is valid JSON)
+_UNPARSED = object()
 
 class Request:
+    # Per-request data from plugins and middleware belongs on ``state``;
+    # path_params is filled in by the router. ``__dict__`` keeps ad-hoc
+    # attributes such as ``request.user = ...`` working alongside the slots
+    __slots__ = (
+        "scope", "receive", "method", "path", "path_params", "_body", "_json", "_state",
+        "_headers", "_query_params", "_depends_cache", "__dict__",
+    )
+
     def __init__(self, scope: Dict, receive: Callable):
         self.scope = scope
         self.receive = receive
+        # Read by the router, plugins and middleware on every request, so
+        # copied out of the scope once instead of a property plus dict lookup
+        self.method: str = scope.get("method")
+        self.path: str = scope.get("path")
         self._body: Optional[bytes] = None
+        self._json: Any = _UNPARSED
+        self._state: Optional[SimpleNamespace] = None
+        self._headers: Optional[RequestHeaders] = None
+        self._query_params: Optional[Dict[str, List[str]]] = None
+        self._depends_cache: Optional[Dict[Callable, Any]] = None  # Filled by Depends
 
     @property
-    def method(self) -> str:
-        return self.scope["method"]
-
-    @property
-    def path(self) -> str:
-        return self.scope["path"]
+    def state(self) -> SimpleNamespace:
+        """Per-request attributes for plugins and middleware, created on first use"""
+        if self._state is None:
+            self._state = SimpleNamespace()
+        return self._state
 
     @property
-    def headers(self) -> Dict[str, str]:
-        return {
-            key.decode("latin-1").lower(): value.decode("latin-1")
-            for key, value in self.scope["headers"]
-        }
+    def headers(self) -> RequestHeaders:
+        if self._headers is None:
+            self._headers = RequestHeaders(self.scope["headers"])
+        return self._headers
 
     @property
     def query_params(self) -> Dict[str, List[str]]:
-        return parse_qs(self.scope["query_string"].decode("latin-1"))
+        if self._query_params is None:
+            query_string = self.scope.get("query_string")
+            # Most requests carry no query string; skip parsing for them
+            self._query_params = _parse_query(query_string) if query_string else {}
+        return self._query_params
 
     async def body(self) -> bytes:
         if self._body is None:
-            self._body = b""
-            more_body = True
-            while more_body:
+            message = await self.receive()
+            chunk = message.get("body", b"")
+            if not message.get("more_body", False):
+                # Single message: keep its bytes as-is, no copy
+                self._body = chunk
+                return chunk
+            # Collect the chunks and join once: each byte is copied a single
+            # time, where growing a bytearray and freezing it copies twice
+            chunks = [chunk]
+            while message.get("more_body", False):
                 message = await self.receive()
-                self._body += message.get("body", b"")
-                more_body = message.get("more_body", False)
+                chunks.append(message.get("body", b""))
+            self._body = b"".join(chunks)
         return self._body
 
     async def json(self) -> Union[Dict, List]:
-        import json
-        return json.loads(await self.body())
\ No newline at end of file
+        """Parse the body as JSON; parsed once, later calls return the same object"""
+        if self._json is _UNPARSED:
+            self._json = json_loads(await self.body())
+        return self._json
+
+    async def msgpack(self) -> Any:
+        """Decode a MessagePack body (requires msgspec)"""
+        return msgpack_loads(await self.body())
\ No newline at end of file
@@ -1,8 +1,114 @@
-from typing import Any, Dict, List, Optional, Union
+from collections.abc import Mapping, MutableMapping
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from http import HTTPStatus
-from keev.utils import json_dumps
+from keev.utils import json_dumps, msgpack_dumps
+
+# Pre-encoded content-type values for the common media types; other media
+# types are added on first use (see _content_type). The ASGI message keys and
+# header names are plain literals: CPython already shares those as code
+# constants, and a module global would only add a lookup.
+_CT_JSON = b"application/json"
+_CT_HTML = b"text/html"
+_CT_PLAIN = b"text/plain"
+_CT_MSGPACK = b"application/msgpack"
+_CONTENT_TYPES = {
+    "application/json": _CT_JSON,
+    "text/html": _CT_HTML,
+    "text/plain": _CT_PLAIN,
+    "application/msgpack": _CT_MSGPACK,
+}
+
+# Header name as passed by callers -> lowercased latin-1 bytes. Response
+# header names come from application code, so the set is small; the cap only
+# guards against code that generates names dynamically.
+_HEADER_NAMES: Dict[str, bytes] = {}
+_ENCODE_CACHE_MAX = 1024
+
+def _header_name(key: str) -> bytes:
+    name = _HEADER_NAMES.get(key)
+    if name is None:
+        name = key.lower().encode("latin-1")
+        if len(_HEADER_NAMES) < _ENCODE_CACHE_MAX:
+            _HEADER_NAMES[key] = name
+    return name
+
+def _content_type(media_type: str) -> bytes:
+    content_type = _CONTENT_TYPES.get(media_type)
+    if content_type is None:
+        content_type = media_type.encode("latin-1")
+        if len(_CONTENT_TYPES) < _ENCODE_CACHE_MAX:
+            _CONTENT_TYPES[media_type] = content_type
+    return content_type
+
+class Headers(MutableMapping):
+    """Case-insensitive str mapping over headers stored as ASGI-ready bytes
+
+    Names are lowercased and names and values encoded once, on insertion, so
+    ``encode`` only has to list the stored pairs. The encoded form of each
+    name is remembered, so looking up a name seen before costs no
+    ``lower()``/``encode()``.
+    """
+    __slots__ = ("_raw",)
+
+    def __init__(self, data: Optional[Mapping[str, str]] = None):
+        self._raw: Dict[bytes, bytes] = {}
+        if data:
+            self.update(data)
+
+    def __getitem__(self, key: str) -> str:
+        return self._raw[_header_name(key)].decode("latin-1")
+
+    def __setitem__(self, key: str, value: str) -> None:
+        self._raw[_header_name(key)] = str(value).encode("latin-1")
+
+    def __delitem__(self, key: str) -> None:
+        del self._raw[_header_name(key)]
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and _header_name(key) in self._raw
+
+    def __iter__(self) -> Iterator[str]:
+        return (key.decode("latin-1") for key in self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __ior__(self, other: Mapping[str, str]) -> "Headers":
+        self.update(other)
+        return self
+
+    def __repr__(self) -> str:
+        return f"Headers({dict(self.items())!r})"
+
+    @classmethod
+    def _from_raw(cls, raw: Dict[bytes, bytes]) -> "Headers":
+        """Wrap an already-encoded dict without copying it"""
+        headers = cls.__new__(cls)
+        headers._raw = raw
+        return headers
+
+    def copy(self) -> "Headers":
+        return Headers._from_raw(self._raw.copy())
+
+    def update_encoded(self, pairs: Mapping[bytes, bytes]) -> None:
+        """Merge pairs that are already lowercased and latin-1 encoded"""
+        self._raw.update(pairs)
+
+    def encode(self) -> List[Tuple[bytes, bytes]]:
+        """ASGI (name, value) byte pairs"""
+        return list(self._raw.items())
+
+# Former name, kept for existing imports
+CaseInsensitiveDict = Headers
+
+# Marks a response whose body hasn't been encoded yet
+_UNENCODED = object()
 
 class Response:
+    __slots__ = ("content", "status_code", "_headers", "_body", "_body_source")
+
+    media_type: Optional[str] = None  # Default Content-Type; subclasses set their own, None means text/plain
+
     def __init__(
         self,
         content: Any,
@@ -12,36 +118,39 @@ class Response:
     ):
         self.content = content
         self.status_code = status_code
-        self._headers: Dict[str, str] = {}
-        
-        # Initialize default headers first
-        if media_type:
-            self._headers["content-type"] = media_type
-        else:
-            self._headers["content-type"] = "text/plain"
-            
-        # Add custom headers
+        # Encoded body and the content object it was encoded from
+        self._body: Optional[bytes] = None
+        self._body_source: Any = _UNENCODED
+
+        # Default content type first, then custom headers, written straight
+        # into the encoded dict rather than through Headers.__setitem__
+        if media_type is None:
+            media_type = self.media_type
+        raw = {b"content-type": _content_type(media_type) if media_type else _CT_PLAIN}
         if headers:
             for key, value in headers.items():
-                self._headers[key.lower()] = str(value)
+                raw[_header_name(key)] = str(value).encode("latin-1")
+        self._headers = Headers._from_raw(raw)
 
     def add_header(self, key: str, value: str) -> None:
         """Add a header with case-insensitive key"""
-        self._headers[key.lower()] = str(value)
+        self._headers[key] = value
 
     @property
-    def headers(self) -> Dict[str, str]:
-        """Get headers with case-insensitive access"""
-        return CaseInsensitiveDict(self._headers)
+    def headers(self) -> Headers:
+        """Get headers with case-insensitive access; changes apply to the response"""
+        return self._headers
 
-    async def __call__(self, scope, receive, send) -> None:
-        body = self._encode_content()
-        headers = self._prepare_headers()
+    async def __call__(self, scope: Dict, receive: Callable, send: Callable) -> None:
+        # The whole send path is two dict literals and two awaits. The body
+        # is encoded (or reused from an earlier send) before the start
+        # message, so a serialization error happens before anything is sent
+        body = self._encoded_body()
 
         await send({
             "type": "http.response.start",
             "status": self.status_code,
-            "headers": headers,
+            "headers": self._headers.encode(),
         })
         await send({
             "type": "http.response.body",
@@ -49,86 +158,63 @@ class Response:
             "more_body": False,
         })
 
-    def _encode_content(self) -> bytes:
-        if isinstance(self.content, (str, bytes)):
-            return self.content.encode("utf-8") if isinstance(self.content, str) else self.content
-        return str(self.content).encode("utf-8")
-
-    def _prepare_headers(self) -> List[tuple]:
-        return [
-            (k.lower().encode("latin-1"), str(v).encode("latin-1"))
-            for k, v in self._headers.items()
-        ]
-
-class CaseInsensitiveDict(dict):
-    """Dictionary with case-insensitive key access"""
-    def __init__(self, data: Dict[str, str]):
-        self._store: Dict[str, str] = {}
-        for key, value in data.items():
-            self._store[key.lower()] = value
+    def _encoded_body(self) -> bytes:
+        """The encoded body, reused for repeat sends while ``content`` is the same object
 
-    def __getitem__(self, key: str) -> str:
-        return self._store[key.lower()]
+        Assign a new ``content`` to change the body; mutating the sent
+        object in place is not picked up.
+        """
+        content = self.content
+        if content is not self._body_source:
+            self._body = self._encode_content()
+            self._body_source = content
+        return self._body
 
-    def __setitem__(self, key: str, value: str) -> None:
-        self._store[key.lower()] = value
-
-    def get(self, key: str, default: Any = None) -> Any:
-        try:
-            return self[key]
-        except KeyError:
-            return default
+    def _encode_content(self) -> bytes:
+        content = self.content
+        if isinstance(content, bytes):
+            return content
+        if isinstance(content, str):
+            return content.encode("utf-8")
+        return str(content).encode("utf-8")
 
-    def __contains__(self, key: str) -> bool:
-        return key.lower() in self._store
+    def _prepare_headers(self) -> List[Tuple[bytes, bytes]]:
+        return self._headers.encode()
 
 class JSONResponse(Response):
-    def __init__(
-        self,
-        content: Any,
-        status_code: int = 200,
-        headers: Optional[Dict[str, str]] = None,
-    ):
-        super().__init__(
-            content,
-            status_code=status_code,
-            headers=headers,
-            media_type="application/json"
-        )
+    __slots__ = ()
+    media_type = "application/json"
 
     def _encode_content(self) -> bytes:
         return json_dumps(self.content)
 
+class MsgPackResponse(Response):
+    """MessagePack-encoded response for internal clients (requires msgspec)"""
+    __slots__ = ()
+    media_type = "application/msgpack"
+
+    def _encode_content(self) -> bytes:
+        return msgpack_dumps(self.content)
+
 class HTMLResponse(Response):
-    def __init__(
-        self,
-        content: str,
-        status_code: int = 200,
-        headers: Optional[Dict[str, str]] = None,
-    ):
-        super().__init__(
-            content,
-            status_code=status_code,
-            headers=headers,
-            media_type="text/html"
-        )
+    __slots__ = ()
+    media_type = "text/html"
 
 class StreamingResponse(Response):
-    def __init__(
-        self,
-        content: Any,
-        status_code: int = 200,
-        headers: Optional[Dict[str, str]] = None,
-        media_type: Optional[str] = None,
-    ):
-        super().__init__(
-            content,
-            status_code=status_code,
-            headers=headers,
-            media_type=media_type
-        )
+    """Send an async iterable of chunks as the response body
+
+    By default every chunk is sent as soon as it is produced, which
+    server-sent events, long polling and progress streams rely on. Bulk
+    streams can set ``chunk_size`` (per class or instance) to coalesce small
+    chunks until that many bytes are buffered, so a line-at-a-time generator
+    doesn't cost one ASGI message per line.
+
+    Unlike the buffered responses this class is not slotted, so instances
+    can override ``chunk_size``.
+    """
+    chunk_size = 0
 
-    async def __call__(self, scope, receive, send) -> None:
+    async def __call__(self, scope: Dict, receive: Callable, send: Callable) -> None:
         headers = self._prepare_headers()
 
         await send({
@@ -137,12 +223,22 @@ class StreamingResponse(Response):
             "headers": headers,
         })
 
+        chunk_size = self.chunk_size
+        buffer = bytearray()
         async for chunk in self.content:
             if isinstance(chunk, str):
                 chunk = chunk.encode("utf-8")
             elif not isinstance(chunk, bytes):
                 chunk = str(chunk).encode("utf-8")
 
+            if buffer or len(chunk) < chunk_size:
+                buffer += chunk
+                if len(buffer) < chunk_size:
+                    continue
+                chunk = bytes(buffer)
+                buffer.clear()
+
+            # Large chunks with nothing buffered go out as-is, without a copy
             await send({
                 "type": "http.response.body",
                 "body": chunk,
@@ -151,6 +247,45 @@ class StreamingResponse(Response):
 
         await send({
             "type": "http.response.body",
-            "body": b"",
+            "body": bytes(buffer),
             "more_body": False,
-        })
\ No newline at end of file
+        })
+
+class StreamingJSONResponse(StreamingResponse):
+    """Stream an iterable of rows as a JSON array without materializing it"""
+    chunk_size = 65536  # Rows are buffered up to this many bytes per body message
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Union[Iterable[Any], AsyncIterable[Any]],
+        status_code: int = 200,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        super().__init__(
+            self._encode_rows(content),
+            status_code=status_code,
+            headers=headers,
+        )
+
+    async def _encode_rows(self, rows: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncIterator[bytes]:
+        buffer = bytearray(b"[")
+        separator = b""
+        if hasattr(rows, "__aiter__"):
+            async for row in rows:
+                buffer += separator
+                buffer += json_dumps(row)
+                separator = b","
+                if len(buffer) >= self.chunk_size:
+                    yield bytes(buffer)
+                    buffer.clear()
+        else:
+            for row in rows:
+                buffer += separator
+                buffer += json_dumps(row)
+                separator = b","
+                if len(buffer) >= self.chunk_size:
+                    yield bytes(buffer)
+                    buffer.clear()
+        buffer += b"]"
+        yield bytes(buffer)
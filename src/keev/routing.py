@@ -2,7 +2,7 @@ from typing import Callable, Dict, List, Optional, Awaitable, Any, Type, Union,
 from keev.requests import Request
 from keev.responses import Response, JSONResponse
 from keev.utils import get_logger, ColoredFormatter
-from keev.exceptions import HTTPException, ValidationError, MethodNotAllowed
+from keev.exceptions import HTTPException, ValidationError, MethodNotAllowed, UnsupportedMediaType
 from pydantic import BaseModel, create_model, ValidationError as PydanticValidationError
 import re
 import inspect
@@ -10,13 +10,68 @@ from functools import wraps, lru_cache
 from dataclasses import dataclass
 import time
 import logging
-from collections import defaultdict
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 
 logger = get_logger("keev.routing")
 
 T = TypeVar('T')
 
+# Strips the parameter names from a route pattern so several routes can be
+# folded into one regex without clashing group names
+_NAMED_GROUP_RE = re.compile(r"\(\?P<[^>]+>")
+
+# A path segment that is exactly one parameter, "{name}" or "{name:type}"
+_PARAM_SEGMENT_RE = re.compile(r"^\{(\w+)(?::[^}]+)?\}$")
+
+def _handler_annotations(handler: Callable) -> Dict[str, Any]:
+    """Parameter annotations of a handler, resolving them only when needed
+
+    Plain annotations are read straight from ``__annotations__``; only when
+    one is a string (e.g. under ``from __future__ import annotations``) or an
+    ``Annotated`` alias does this fall back to ``get_type_hints``, which
+    resolves the former and strips the latter. The result is kept on the function.
+    """
+    annotations = getattr(handler, "__annotations__", None) or {}
+    if not any(
+        isinstance(value, str) or hasattr(value, "__metadata__")
+        for value in annotations.values()
+    ):
+        return annotations
+    hints = getattr(handler, "__keev_type_hints__", None)
+    if hints is None:
+        hints = get_type_hints(handler)
+        try:
+            handler.__keev_type_hints__ = hints
+        except AttributeError:
+            pass
+    return hints
+
+_TRUE_VALUES = frozenset({"true", "True", "TRUE", "1", "yes", "on"})
+_FALSE_VALUES = frozenset({"false", "False", "FALSE", "0", "no", "off"})
+
+def _to_bool(value: str) -> bool:
+    """Path parameter converter for bool; unrecognized values fail the match"""
+    if value in _TRUE_VALUES:
+        return True
+    if value in _FALSE_VALUES:
+        return False
+    raise ValueError(f"invalid boolean: {value}")
+
+def _is_model(annotation: Any) -> bool:
+    """True for BaseModel subclasses; False for Optional[...], generics, strings etc."""
+    try:
+        return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+    except TypeError:
+        # Parameterized generics pass the isinstance check on Python < 3.11
+        return False
+
+# Path tree node keys; request segments never contain "/", so these cannot
+# collide with a literal segment
+_TREE_PARAMS = "/params"
+_TREE_ROUTES = "/routes"
+_TREE_FIRST = "/first"  # Lowest registration order of any route below a node
+
 @dataclass
 class RouteMetadata:
     """Metadata for route documentation and validation"""
@@ -36,23 +91,33 @@ class RequestContext:
 class Depends:
     def __init__(self, dependency: Callable[..., T]):
         self.dependency = dependency
-        self._cache = {}
+        # Resolved once here; calls only walk this plan
+        self._sig = inspect.signature(dependency)
+        self._is_coroutine = inspect.iscoroutinefunction(dependency)
+        self._params = tuple(
+            (name, param.default if isinstance(param.default, Depends) else None)
+            for name, param in self._sig.parameters.items()
+            if name == "request" or isinstance(param.default, Depends)
+        )
 
     async def __call__(self, request: Request) -> T:
-        if self.dependency in self._cache:
-            return self._cache[self.dependency]
+        # Results are memoized per request, so a dependency shared by several
+        # others runs once per request and never leaks into the next one
+        cache = request._depends_cache
+        if cache is None:
+            cache = request._depends_cache = {}
+        elif self.dependency in cache:
+            return cache[self.dependency]
 
-        sig = inspect.signature(self.dependency)
         kwargs = {}
-
-        for param_name, param in sig.parameters.items():
-            if param_name == "request":
+        for param_name, sub_dependency in self._params:
+            if sub_dependency is None:
                 kwargs[param_name] = request
-            elif isinstance(param.default, Depends):
-                kwargs[param_name] = await param.default(request)
+            else:
+                kwargs[param_name] = await sub_dependency(request)
 
-        result = await self.dependency(**kwargs) if inspect.iscoroutinefunction(self.dependency) else self.dependency(**kwargs)
-        self._cache[self.dependency] = result
+        result = await self.dependency(**kwargs) if self._is_coroutine else self.dependency(**kwargs)
+        cache[self.dependency] = result
         return result
 
 @dataclass
@@ -62,21 +127,43 @@ class RateLimit:
     by: str = "ip"
 
 class RateLimiter:
+    sweep_interval = 1024  # Checks between sweeps of idle keys
+
     def __init__(self):
-        self.requests = defaultdict(list)
+        # Key -> request timestamps (monotonic seconds), oldest first
+        self.requests: Dict[str, deque] = defaultdict(deque)
+        self._checks = 0
+        self._max_window = 0
 
     async def is_allowed(self, key: str, limit: RateLimit) -> bool:
-        now = time.time()
-        self.requests[key] = [ts for ts in self.requests[key] if now - ts < limit.window]
-        if len(self.requests[key]) >= limit.requests:
+        now = time.monotonic()
+        if limit.window > self._max_window:
+            self._max_window = limit.window
+        self._checks += 1
+        if self._checks >= self.sweep_interval:
+            self._checks = 0
+            self._sweep(now - self._max_window)
+
+        cutoff = now - limit.window
+        timestamps = self.requests[key]
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()
+        if len(timestamps) >= limit.requests:
             return False
-        self.requests[key].append(now)
+        timestamps.append(now)
         return True
 
+    def _sweep(self, cutoff: float) -> None:
+        """Drop keys with no request inside the longest window seen, bounding memory"""
+        idle = [key for key, timestamps in self.requests.items() if not timestamps or timestamps[-1] <= cutoff]
+        for key in idle:
+            del self.requests[key]
+
 class Route:
     __slots__ = ("path", "handler", "methods", "param_types", "regex", "name", "version", 
                  "dependencies", "rate_limit", "csrf_protect", "secure_headers", "response_model",
-                 "_compiled_regex", "_param_converters", "metadata", "_needs_request")
+                 "_compiled_regex", "_param_converters", "metadata", "_needs_request",
+                 "is_static", "_regex_body", "_ctx_param", "_body_params")
     
     def __init__(
         self, 
@@ -113,12 +200,33 @@ class Route:
         self._needs_request = "request" in sig.parameters or "ctx" in sig.parameters
 
         # Extract type hints from handler for path parameters
-        type_hints = get_type_hints(handler)
+        type_hints = _handler_annotations(handler)
         for param_name, param_type in type_hints.items():
-            if param_name not in ("request", "ctx") and param_name not in self.param_types:
+            if param_name not in ("request", "ctx", "return") and param_name not in self.param_types:
                 self.param_types[param_name] = param_type
 
         self._compile()
+        self._plan(sig, type_hints)
+
+    def _plan(self, sig: inspect.Signature, type_hints: Dict[str, Any]) -> None:
+        """Work out once how the handler is called, so dispatch needs no inspect"""
+        if "ctx" in sig.parameters:
+            self._ctx_param = "ctx"
+        elif "request" in sig.parameters:
+            self._ctx_param = "request"
+        else:
+            self._ctx_param = None
+
+        path_params = self._compiled_regex.groupindex
+        body_params = []
+        for name, param in sig.parameters.items():
+            if name in path_params or name == self._ctx_param:
+                continue
+            annotation = type_hints.get(name, param.annotation)
+            if _is_model(annotation):
+                # pydantic-core validator, used on the raw body in one pass
+                body_params.append((name, annotation.__pydantic_validator__))
+        self._body_params = tuple(body_params)
 
     def _compile(self):
         """Pre-compile regex and parameter converters for better performance"""
@@ -135,19 +243,24 @@ class Route:
             elif type_ == float:
                 self._param_converters[name] = float
             elif type_ == bool:
-                self._param_converters[name] = lambda x: x.lower() == "true"
+                self._param_converters[name] = _to_bool
             else:
                 self._param_converters[name] = str
 
+        self._regex_body = path_regex
         self._compiled_regex = re.compile(f"^{path_regex}/?$")
+        self.is_static = "{" not in self.path
 
     def match(self, path: str) -> Optional[Dict[str, Any]]:
         match = self._compiled_regex.match(path)
         if not match:
             return None
-            
+        return self._convert(match.groupdict())
+
+    def _convert(self, values: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Convert raw path segments to the handler's parameter types"""
         params = {}
-        for name, value in match.groupdict().items():
+        for name, value in values.items():
             if converter := self._param_converters.get(name):
                 try:
                     params[name] = converter(value)
@@ -159,7 +272,14 @@ class Route:
         return params
 
 class Router:
-    __slots__ = ("routes", "prefix", "version", "logger", "_method_routes", "_path_tree")
+    """Collection of routes with an indexed lookup
+
+    Routes are resolved as a scan in registration order would resolve
+    them: when several patterns match a path, the route registered first
+    wins, whether it is static, parameterized or regex-only.
+    """
+    __slots__ = ("routes", "prefix", "version", "logger", "_method_routes", "_path_tree",
+                 "_static_routes", "_dynamic_routes", "_dynamic_patterns")
 
     def __init__(self, prefix: str = "", version: str = None):
         self.routes: List[Route] = []
@@ -167,7 +287,12 @@ class Router:
         self.version = version
         self.logger = get_logger(f"keev.router{'.'+version if version else ''}")
         self._method_routes = defaultdict(list)  # Method -> [Route]
-        self._path_tree = {}  # Radix tree for faster lookups
+        self._path_tree = {}  # Segment tree for parameterized paths, see _insert_tree
+        # Routes below are stored with their registration order, so a lookup
+        # can return the first registered match like a scan of self.routes
+        self._static_routes = defaultdict(dict)  # Method -> {path: (order, Route)} for paths without parameters
+        self._dynamic_routes = defaultdict(list)  # Method -> [(order, Route)] for patterns the tree can't hold
+        self._dynamic_patterns = {}  # Method -> (combined regex, {group index: (route position, param names)})
 
     def _build_path(self, path: str) -> str:
         """Build full path including prefix and version"""
@@ -179,12 +304,22 @@ class Router:
         parts.append(path.lstrip("/"))
         return "/" + "/".join(filter(None, parts))
 
-    async def _extract_body_params(self, request: Request, param_type: Type[BaseModel]) -> Any:
-        """Extract and validate parameters from request body"""
+    async def _extract_body_params(self, request: Request, validator: Any) -> Any:
+        """Extract and validate parameters from request body
+
+        JSON bodies are parsed and validated in one pass; clients sending
+        ``Content-Type: application/msgpack`` get their body decoded first,
+        or a 415 when msgspec isn't installed.
+        """
         try:
-            body = await request.json()
-            return param_type.model_validate(body)
-        except Exception as e:
+            if request.headers.get("content-type", "").startswith("application/msgpack"):
+                try:
+                    data = await request.msgpack()
+                except ImportError:
+                    raise UnsupportedMediaType("MessagePack bodies are not supported")
+                return validator.validate_python(data)
+            return validator.validate_json(await request.body())
+        except ValueError as e:  # pydantic's and msgspec's errors are both ValueErrors
             logger.error(f"Parameter validation error: {e}")
             raise ValidationError(str(e))
 
@@ -210,7 +345,7 @@ class Router:
             param_types = {}
             
             sig = inspect.signature(handler)
-            type_hints = get_type_hints(handler)
+            type_hints = _handler_annotations(handler)
             
             for param_name, param in sig.parameters.items():
                 if param_name in ("request", "ctx"):
@@ -257,11 +392,168 @@ class Router:
         return self.route(path, methods=["OPTIONS"], **kwargs)
 
     def add_route(self, route: Route) -> None:
+        order = len(self.routes)
         self.routes.append(route)
+        static_path = route.path.rstrip("/") or "/"
         for method in route.methods:
             self._method_routes[method].append(route)
+            if route.is_static:
+                # First registration wins, as with the ordered scan
+                self._static_routes[method].setdefault(static_path, (order, route))
+        if not route.is_static and not self._insert_tree(route, order):
+            for method in route.methods:
+                self._dynamic_routes[method].append((order, route))
+                self._dynamic_patterns.pop(method, None)
         self.logger.debug(f"Added route: {route.methods} {route.path}")
 
+    def _insert_tree(self, route: Route, order: int) -> bool:
+        """Add a parameterized route to the path tree
+
+        Each node maps literal segments to child nodes, and keeps
+        ``_TREE_PARAMS`` as a list of (param name, child node) slots,
+        ``_TREE_ROUTES`` as {method: [(order, Route)]} for routes ending there
+        and ``_TREE_FIRST`` as the lowest order of any route below it. Returns
+        False for patterns with partial-segment parameters (such as
+        "/files/{name}.txt"), which stay on the regex path.
+        """
+        segments = route.path.rstrip("/").split("/")[1:]
+        path_params = route._compiled_regex.groupindex
+        for segment in segments:
+            if "{" in segment:
+                param = _PARAM_SEGMENT_RE.match(segment)
+                if param is None or param.group(1) not in path_params:
+                    return False
+
+        node = self._path_tree
+        node.setdefault(_TREE_FIRST, order)
+        for segment in segments:
+            if "{" not in segment:
+                node = node.setdefault(segment, {_TREE_FIRST: order})
+                continue
+            name = _PARAM_SEGMENT_RE.match(segment).group(1)
+            slots = node.setdefault(_TREE_PARAMS, [])
+            for slot_name, child in slots:
+                if slot_name == name:
+                    node = child
+                    break
+            else:
+                child = {_TREE_FIRST: order}
+                slots.append((name, child))
+                node = child
+
+        routes = node.setdefault(_TREE_ROUTES, {})
+        for method in route.methods:
+            routes.setdefault(method, []).append((order, route))
+        return True
+
+    def _walk_tree(self, node: Dict, segments: List[str], index: int, method: str,
+                   values: List[tuple], bound: int):
+        """Depth-first search for the first-registered match, as (order, route, params)
+
+        Only routes registered before ``bound`` are of interest; each match
+        found lowers it, and subtrees whose routes all came later are skipped.
+        """
+        if node[_TREE_FIRST] >= bound:
+            return None
+        if index == len(segments):
+            for order, route in node.get(_TREE_ROUTES, {}).get(method, ()):
+                if order >= bound:
+                    break
+                params = route._convert(dict(values))
+                if params is not None:
+                    return order, route, params
+            return None
+
+        best = None
+        segment = segments[index]
+        child = node.get(segment)
+        if child is not None:
+            best = self._walk_tree(child, segments, index + 1, method, values, bound)
+            if best is not None:
+                bound = best[0]
+
+        if segment:
+            for name, child in node.get(_TREE_PARAMS, ()):
+                values.append((name, segment))
+                found = self._walk_tree(child, segments, index + 1, method, values, bound)
+                values.pop()
+                if found is not None:
+                    best = found
+                    bound = found[0]
+        return best
+
+    def _compile_dynamic(self, method: str):
+        """Fold the regex-only routes of a method into a single alternation regex
+
+        Each route's pattern becomes one unnamed outer group; ``groups`` maps
+        that group's index to the route's position and the absolute
+        (group index, param name) pairs of its parameters.
+        """
+        alternatives = []
+        groups = {}
+        index = 1
+        for position, (_, route) in enumerate(self._dynamic_routes[method]):
+            pattern = route._compiled_regex
+            params = tuple(sorted((index + group, name) for name, group in pattern.groupindex.items()))
+            alternatives.append(f"({_NAMED_GROUP_RE.sub('(', route._regex_body)})")
+            groups[index] = (position, params)
+            index += pattern.groups + 1
+        compiled = (re.compile(f"^(?:{'|'.join(alternatives)})/?$"), groups)
+        self._dynamic_patterns[method] = compiled
+        return compiled
+
+    def _find_route(self, method: str, path: str):
+        """Resolve a method and normalized path to (route, params), or None
+
+        Like a scan of the routes in registration order, the first route
+        registered that matches wins, whichever index holds it.
+        """
+        best = None
+        bound = len(self.routes)
+        static = self._static_routes.get(method)
+        if static:
+            entry = static.get(path)
+            if entry is not None:
+                best = (entry[0], entry[1], {})
+                bound = entry[0]
+
+        if self._path_tree:
+            found = self._walk_tree(self._path_tree, path.split("/")[1:], 0, method, [], bound)
+            if found is not None:
+                best = found
+                bound = found[0]
+
+        routes = self._dynamic_routes.get(method)
+        if routes and routes[0][0] < bound:
+            found = self._match_dynamic(method, routes, path)
+            if found is not None and found[0] < bound:
+                best = found
+
+        return None if best is None else (best[1], best[2])
+
+    def _match_dynamic(self, method: str, routes: List[tuple], path: str):
+        """First regex-only route matching path, as (order, route, params)"""
+        pattern, groups = self._dynamic_patterns.get(method) or self._compile_dynamic(method)
+        match = pattern.match(path)
+        if match is None:
+            return None
+
+        # One match attempt for all of them: the route's own group closes
+        # last, so lastindex identifies which alternative fired
+        position, group_names = groups[match.lastindex]
+        values = {name: match.group(group) for group, name in group_names}
+        order, route = routes[position]
+        params = route._convert(values)
+        if params is not None:
+            return order, route, params
+
+        # A converter rejected the value; keep scanning the routes after it
+        for order, route in routes[position + 1:]:
+            params = route.match(path)
+            if params is not None:
+                return order, route, params
+        return None
+
     def include_router(self, router: 'Router', prefix: str = "") -> None:
         """Include another router's routes with an optional prefix"""
         for route in router.routes:
@@ -286,25 +578,14 @@ class Router:
         if not path:
             path = "/"
 
-        # Fast lookup by method first
-        method_routes = self._method_routes.get(request.method, [])
-        matched_route = None
-        params = None
-
-        # First try to find a route that matches both path and method
-        for route in method_routes:
-            route_params = route.match(path)
-            if route_params is not None:
-                matched_route = route
-                params = route_params
-                break
+        found = self._find_route(request.method, path)
 
         # If no route matches both path and method, check if the path exists for any method
-        if not matched_route:
+        if found is None:
             allowed_methods = set()
-            for route in self.routes:
-                if route.match(path):
-                    allowed_methods.update(route.methods)
+            for method in self._method_routes:
+                if method != request.method and self._find_route(method, path) is not None:
+                    allowed_methods.add(method)
 
             if allowed_methods:
                 # Path exists but method not allowed
@@ -319,24 +600,20 @@ class Router:
             return JSONResponse({"error": "Not Found"}, status_code=404)
 
         # Process the matched route
+        matched_route, params = found
         request.path_params = params
-        handler_sig = inspect.signature(matched_route.handler)
-        handler_params = {}
 
         try:
-            # Add path parameters
-            handler_params.update(params)
-
-            # Add request context if needed
-            if "ctx" in handler_sig.parameters:
+            # Path parameters, then whatever the route's call plan asks for
+            handler_params = dict(params)
+            ctx_param = matched_route._ctx_param
+            if ctx_param == "ctx":
                 handler_params["ctx"] = RequestContext(request)
-            elif "request" in handler_sig.parameters:
+            elif ctx_param == "request":
                 handler_params["request"] = request
 
-            # Add body parameters for models
-            for name, param in handler_sig.parameters.items():
-                if name not in handler_params and issubclass(param.annotation, BaseModel):
-                    handler_params[name] = await self._extract_body_params(request, param.annotation)
+            for name, validator in matched_route._body_params:
+                handler_params[name] = await self._extract_body_params(request, validator)
 
             return await matched_route.handler(**handler_params)
         except ValidationError as e:
@@ -1,57 +1,109 @@
 import os
 import mimetypes
+import stat
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Optional
-from keev.responses import Response
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from keev.responses import Response, StreamingResponse
 import aiofiles
 from keev.responses import JSONResponse
 from keev.utils import get_logger
 
 logger = get_logger("keev.static")
 
+class FileResponse(StreamingResponse):
+    """Send a file from disk without loading it into memory
+
+    If the server offers the ``http.response.pathsend`` extension the file
+    path is handed over and the server sends it itself (typically with
+    sendfile(2)); otherwise the file is streamed in ``chunk_size`` pieces.
+    """
+    chunk_size = 65536
+
+    def __init__(self, path: Union[str, Path], headers: Optional[dict] = None, media_type: Optional[str] = None):
+        self.path = path
+        super().__init__(self._iter_file(), headers=headers, media_type=media_type)
+
+    async def _iter_file(self):
+        async with aiofiles.open(self.path, mode="rb") as f:
+            while chunk := await f.read(self.chunk_size):
+                yield chunk
+
+    async def __call__(self, scope: Dict, receive: Callable, send: Callable) -> None:
+        if "http.response.pathsend" not in scope.get("extensions", {}):
+            await super().__call__(scope, receive, send)
+            return
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self._prepare_headers(),
+        })
+        await send({"type": "http.response.pathsend", "path": str(self.path)})
+
 class StaticFiles:
+    cache_max_file_size = 256 * 1024  # Larger files are always streamed from disk
+    cache_max_bytes = 8 * 1024 * 1024  # Total size of cached file contents
+
     def __init__(self, directory: str):
         """Initialize static file handler with a directory"""
         self.directory = Path(directory)
         if not self.directory.exists():
             os.makedirs(str(self.directory))
+        # Resolved once; requested paths are checked against it lexically
+        self._root = os.path.realpath(str(self.directory))
+        self._root_prefix = os.path.join(self._root, "")
+        # Resolved path -> (mtime_ns, size, content, content type), least
+        # recently used first; an entry is reused only while mtime and size match
+        self._cache: "OrderedDict[str, Tuple[int, int, bytes, str]]" = OrderedDict()
+        self._cache_bytes = 0
         logger.info(f"Serving static files from: {self.directory}")
 
     async def __call__(self, request) -> Optional[Response]:
         """Handle static file request"""
         path = request.path_params.get("path", "")
-        file_path = self.directory / path
+        file_path = os.path.normpath(os.path.join(self._root, path.lstrip("/")))
 
-        # Security check - prevent directory traversal
-        try:
-            file_path = file_path.resolve()
-            if not str(file_path).startswith(str(self.directory.resolve())):
-                logger.warning(f"Attempted directory traversal: {path}")
-                return JSONResponse({"error": "Not Found"}, status_code=404)
-        except Exception:
-            logger.warning(f"Invalid path: {path}")
+        # Security check - prevent directory traversal; "..", absolute and
+        # sibling-prefix paths all normalize to somewhere outside the root
+        if file_path != self._root and not file_path.startswith(self._root_prefix):
+            logger.warning(f"Attempted directory traversal: {path}")
             return JSONResponse({"error": "Not Found"}, status_code=404)
 
-        if not file_path.exists() or not file_path.is_file():
+        # One stat answers exists, is-a-file, size and mtime
+        try:
+            st = os.stat(file_path)
+        except (OSError, ValueError):
+            st = None
+        if st is None or not stat.S_ISREG(st.st_mode):
             logger.warning(f"File not found: {path}")
             return JSONResponse({"error": "Not Found"}, status_code=404)
 
         try:
+            key = file_path
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                self._cache.move_to_end(key)
+                return self._cached_response(entry)
+
             # Get proper content type
-            content_type, _ = mimetypes.guess_type(str(file_path))
+            content_type, _ = mimetypes.guess_type(key)
             if not content_type:
                 # Default to octet-stream if type cannot be guessed
                 content_type = "application/octet-stream"
 
-            async with aiofiles.open(file_path, mode="rb") as f:
-                content = await f.read()
-
             logger.info(f"Serving file: {path}")
-            return Response(
-                content,
+            if st.st_size <= self.cache_max_file_size:
+                async with aiofiles.open(file_path, mode="rb") as f:
+                    content = await f.read()
+                entry = (st.st_mtime_ns, st.st_size, content, content_type)
+                self._store(key, entry)
+                return self._cached_response(entry)
+
+            return FileResponse(
+                file_path,
                 headers={
                     "Content-Type": content_type,
-                    "Content-Length": str(len(content)),
+                    "Content-Length": str(st.st_size),
                     "Cache-Control": "public, max-age=3600",
                 }
             )
@@ -59,6 +111,29 @@ class StaticFiles:
             logger.error(f"Error serving file {path}: {e}")
             return JSONResponse({"error": "Internal Server Error"}, status_code=500)
 
+    @staticmethod
+    def _cached_response(entry: Tuple[int, int, bytes, str]) -> Response:
+        _, size, content, content_type = entry
+        return Response(
+            content,
+            headers={
+                "Content-Type": content_type,
+                "Content-Length": str(size),
+                "Cache-Control": "public, max-age=3600",
+            }
+        )
+
+    def _store(self, key: str, entry: Tuple[int, int, bytes, str]) -> None:
+        """Insert a cache entry, evicting least recently used files over budget"""
+        old = self._cache.pop(key, None)
+        if old is not None:
+            self._cache_bytes -= len(old[2])
+        self._cache[key] = entry
+        self._cache_bytes += len(entry[2])
+        while self._cache_bytes > self.cache_max_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= len(evicted[2])
+
     def write_file(self, path: str, content: str) -> None:
         """Write content to a static file"""
         file_path = self.directory / path
@@ -1,8 +1,9 @@
 import logging
 import os
-from typing import Any, Dict, Optional
+import sys
+import time
+from typing import Any, Callable, Dict, Optional
 import orjson
-from datetime import datetime
 
 COLORS = {
     'RESET': '\033[0m',
@@ -16,6 +17,9 @@ COLORS = {
     'BOLD': '\033[1m'
 }
 
+# Colors are only emitted when stderr (where StreamHandler writes) is a terminal
+_STDERR_IS_TTY = hasattr(sys.stderr, "isatty") and sys.stderr.isatty()
+
 class ColoredFormatter(logging.Formatter):
     level_colors = {
         logging.DEBUG: COLORS['BLUE'],
@@ -25,32 +29,55 @@ class ColoredFormatter(logging.Formatter):
         logging.CRITICAL: COLORS['RED'] + COLORS['BOLD']
     }
 
-    def format(self, record):
-        # Add color to level name
-        level_color = self.level_colors.get(record.levelno, COLORS['RESET'])
-        colored_level = f"{level_color}{record.levelname}{COLORS['RESET']}"
+    def __init__(self, *args, use_color: Optional[bool] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if use_color is None:
+            use_color = _STDERR_IS_TTY
+        colors = COLORS if use_color else dict.fromkeys(COLORS, "")
+        self._colors = colors
+        reset = colors['RESET']
+        # Everything that doesn't depend on the message is wrapped once up front
+        self._level_tags = {
+            level: f"{color if use_color else ''}{logging.getLevelName(level)}{reset}"
+            for level, color in self.level_colors.items()
+        }
+        self._name_tags: Dict[str, str] = {}
+        self._last_second: Optional[int] = None
+        self._last_timestamp = ""
+
+    def _timestamp(self, created: float) -> str:
+        # Records logged within the same second share one formatted timestamp
+        second = int(created)
+        if second != self._last_second:
+            self._last_second = second
+            timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(second))
+            self._last_timestamp = f"{self._colors['CYAN']}{timestamp}{self._colors['RESET']}"
+        return self._last_timestamp
 
-        # Format timestamp
-        timestamp = datetime.fromtimestamp(record.created).strftime('%Y-%m-%d %H:%M:%S')
-        colored_timestamp = f"{COLORS['CYAN']}{timestamp}{COLORS['RESET']}"
+    def format(self, record):
+        colors = self._colors
+        level_tag = self._level_tags.get(record.levelno)
+        if level_tag is None:
+            level_tag = f"{record.levelname}{colors['RESET']}"
 
-        # Format name
-        colored_name = f"{COLORS['MAGENTA']}{record.name}{COLORS['RESET']}"
+        name_tag = self._name_tags.get(record.name)
+        if name_tag is None:
+            name_tag = self._name_tags[record.name] = f"{colors['MAGENTA']}{record.name}{colors['RESET']}"
 
         # Build message
-        message = f"{colored_timestamp} [{colored_level}] {colored_name}: {record.getMessage()}"
+        message = f"{self._timestamp(record.created)} [{level_tag}] {name_tag}: {record.getMessage()}"
 
         # Add method and path if available
         if hasattr(record, 'method'):
-            message = f"{message} [{COLORS['YELLOW']}{record.method}{COLORS['RESET']}]"
+            message = f"{message} [{colors['YELLOW']}{record.method}{colors['RESET']}]"
         if hasattr(record, 'path'):
-            message = f"{message} {COLORS['CYAN']}{record.path}{COLORS['RESET']}"
+            message = f"{message} {colors['CYAN']}{record.path}{colors['RESET']}"
 
         # Add exception info if available
         if record.exc_info:
             if not record.exc_text:
                 record.exc_text = self.formatException(record.exc_info)
-            message = f"{message}\n{COLORS['RED']}{record.exc_text}{COLORS['RESET']}"
+            message = f"{message}\n{colors['RED']}{record.exc_text}{colors['RESET']}"
 
         return message
 
@@ -92,10 +119,35 @@ def get_env_var(name: str, default: Optional[str] = None) -> str:
         raise ValueError(f"Environment variable {name} is required")
     return value
 
-def json_dumps(data: Any) -> bytes:
-    """Convert data to JSON bytes using orjson"""
-    return orjson.dumps(data)
-
-def json_loads(data: bytes) -> Any:
-    """Parse JSON bytes using orjson"""
-    return orjson.loads(data)
\ No newline at end of file
+# JSON goes through orjson everywhere (responses, request bodies, WebSocket
+# frames, docs). The helpers are orjson's own C functions rather than Python
+# wrappers around them, so a call costs no extra interpreter frame:
+#   json_dumps(data) -> bytes
+#   json_loads(data: bytes | str) -> Any
+json_dumps: Callable[..., bytes] = orjson.dumps
+json_loads: Callable[..., Any] = orjson.loads
+
+# msgspec is optional; its MessagePack encoder/decoder are created on first use
+_msgpack_encoder = None
+_msgpack_decoder = None
+
+def _load_msgpack():
+    global _msgpack_encoder, _msgpack_decoder
+    try:
+        from msgspec import msgpack
+    except ImportError as e:
+        raise ImportError("MessagePack support requires msgspec: pip install msgspec") from e
+    _msgpack_encoder = msgpack.Encoder()
+    _msgpack_decoder = msgpack.Decoder()
+
+def msgpack_dumps(data: Any) -> bytes:
+    """Convert data to MessagePack bytes using msgspec"""
+    if _msgpack_encoder is None:
+        _load_msgpack()
+    return _msgpack_encoder.encode(data)
+
+def msgpack_loads(data: bytes) -> Any:
+    """Parse MessagePack bytes using msgspec"""
+    if _msgpack_decoder is None:
+        _load_msgpack()
+    return _msgpack_decoder.decode(data)
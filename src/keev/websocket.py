@@ -1,13 +1,52 @@
-from typing import Any, Dict, Callable, Awaitable, Optional
-from keev.utils import get_logger
-import websockets
-import json
+from typing import Any, Dict, Callable, Awaitable, Optional, Set
+from keev.utils import get_logger, json_dumps, json_loads, msgpack_dumps, msgpack_loads
 import asyncio
+import sys
+import weakref
 from dataclasses import dataclass
 
 logger = get_logger("keev.websocket")
 
-@dataclass
+try:
+    from websockets.exceptions import ConnectionClosed as _ClosedBase
+    from websockets.frames import Close as _CloseFrame
+except ImportError:  # websockets is optional; without it this is a plain exception
+    _ClosedBase = Exception
+    _CloseFrame = None
+
+class _WSClosed(_ClosedBase):
+    """Raised by receive/send once the connection is closed
+
+    When websockets is installed this subclasses ``websockets.ConnectionClosed``
+    so existing ``except websockets.ConnectionClosed`` handlers still catch
+    it, with the close code carried as the received close frame. ``code`` and
+    ``reason`` are plain attributes either way.
+    """
+    __slots__ = ("code", "reason")
+
+    def __init__(self, code: int, reason: str = ""):
+        if _CloseFrame is None:
+            Exception.__init__(self, code, reason)
+        else:
+            super().__init__(_CloseFrame(code, reason), None)
+        self.code = code
+        self.reason = reason
+
+ConnectionClosed = _WSClosed
+
+_RECEIVE = "websocket.receive"
+_DISCONNECT = "websocket.disconnect"
+_SEND = "websocket.send"
+_CLOSE = "websocket.close"
+
+# Constant messages are built once and reused; ASGI servers don't mutate
+# the messages they are sent
+_ACCEPT = {"type": "websocket.accept", "subprotocol": None}
+_NORMAL_CLOSE = {"type": _CLOSE, "code": 1000, "reason": ""}
+_ERROR_CLOSE = {"type": _CLOSE, "code": 1011, "reason": "Internal error"}
+
+# Slotted where dataclasses support it (Python 3.10+)
+@dataclass(**({"slots": True} if sys.version_info >= (3, 10) else {}))
 class WebSocketState:
     """WebSocket connection state"""
     connected: bool = False
@@ -16,110 +55,246 @@ class WebSocketState:
     close_reason: Optional[str] = None
 
 class WebSocket:
+    __slots__ = ("scope", "receive", "send", "state", "_closed", "_outbox", "_writer", "__weakref__")
+
+    outbox_size = 1024  # Queued outbound frames before a pooled client counts as too slow
+    drain_timeout = 5.0  # Seconds to wait for queued frames to be written when a connection ends
+    write_batch_size = 32  # Frames the writer task takes off the queue per wakeup
+
     def __init__(self, scope: Dict, receive: Callable, send: Callable):
         self.scope = scope
         self.receive = receive
         self.send = send
         self.state = WebSocketState()
-        self._ws: Optional[websockets.WebSocketServerProtocol] = None
+        # Mirrors state.closed; checked directly on every send (one slot
+        # lookup instead of two), state stays the public report
+        self._closed = False
+        # Set while a WebSocketPool writer task owns the outbound side
+        self._outbox: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
 
     async def accept(self, subprotocol: Optional[str] = None):
         """Accept the WebSocket connection"""
         if self.state.connected:
             return
 
-        await self.send({
-            "type": "websocket.accept",
-            "subprotocol": subprotocol
-        })
+        if subprotocol is None:
+            await self.send(_ACCEPT)
+        else:
+            await self.send({"type": "websocket.accept", "subprotocol": subprotocol})
         self.state.connected = True
         logger.info("WebSocket connection accepted")
 
     async def receive_text(self) -> str:
         """Receive text message"""
-        message = await self.receive()
-        
-        if message["type"] == "websocket.disconnect":
-            self.state.closed = True
-            self.state.close_code = message.get("code", 1000)
-            raise websockets.ConnectionClosed(
-                self.state.close_code,
-                message.get("reason", "")
-            )
-            
-        if message["type"] != "websocket.receive":
-            raise ValueError(f"Unexpected message type: {message['type']}")
-            
-        return message.get("text", "")
+        return await self._receive_frame("text", "")
 
     async def receive_json(self) -> Any:
         """Receive JSON message"""
         text = await self.receive_text()
-        return json.loads(text)
+        return json_loads(text)
 
     async def receive_bytes(self) -> bytes:
         """Receive bytes message"""
+        return await self._receive_frame("bytes", b"")
+
+    async def receive_msgpack(self) -> Any:
+        """Receive MessagePack message (requires msgspec)"""
+        return msgpack_loads(await self._receive_frame("bytes", b""))
+
+    async def _receive_frame(self, key: str, default: Any) -> Any:
+        """Await the next frame and return its ``key`` payload, raising on disconnect"""
         message = await self.receive()
-        
-        if message["type"] == "websocket.disconnect":
-            self.state.closed = True
+        message_type = message["type"]
+        if message_type == _RECEIVE:
+            # The key is present on nearly every frame; only a frame of the
+            # other kind may leave it out per the ASGI spec
+            try:
+                return message[key]
+            except KeyError:
+                return default
+
+        if message_type == _DISCONNECT:
+            self._stop_writer()
+            self._closed = self.state.closed = True
             self.state.close_code = message.get("code", 1000)
-            raise websockets.ConnectionClosed(
+            raise _WSClosed(
                 self.state.close_code,
                 message.get("reason", "")
             )
-            
-        if message["type"] != "websocket.receive":
-            raise ValueError(f"Unexpected message type: {message['type']}")
-            
-        return message.get("bytes", b"")
+        raise ValueError(f"Unexpected message type: {message_type}")
 
     async def send_text(self, text: str):
         """Send text message"""
-        if self.state.closed:
-            raise websockets.ConnectionClosed(
+        if self._closed:
+            raise _WSClosed(
                 self.state.close_code or 1006,
                 "WebSocket is closed"
             )
             
-        await self.send({
-            "type": "websocket.send",
-            "text": text
-        })
+        await self._write({"type": _SEND, "text": text})
 
     async def send_json(self, data: Any):
-        """Send JSON message"""
-        await self.send_text(json.dumps(data))
+        """Send JSON message
+
+        ``bytes``/``bytearray`` are taken as already-encoded JSON (such as a
+        cached ``json_dumps`` result) and sent without re-serializing.
+        """
+        if not isinstance(data, (bytes, bytearray)):
+            data = json_dumps(data)
+        # orjson encodes to UTF-8 bytes; the ASGI text field needs a str
+        await self.send_text(data.decode())
+
+    async def send_prepared_json(self, text: str):
+        """Send a JSON document that has already been encoded to text"""
+        await self.send_text(text)
+
+    async def send_msgpack(self, data: Any):
+        """Send MessagePack message as a binary frame (requires msgspec)"""
+        await self.send_bytes(msgpack_dumps(data))
 
     async def send_bytes(self, data: bytes):
         """Send bytes message"""
-        if self.state.closed:
-            raise websockets.ConnectionClosed(
+        if self._closed:
+            raise _WSClosed(
                 self.state.close_code or 1006,
                 "WebSocket is closed"
             )
             
-        await self.send({
-            "type": "websocket.send",
-            "bytes": data
-        })
+        await self._write({"type": _SEND, "bytes": data})
 
     async def close(self, code: int = 1000, reason: str = ""):
         """Close the WebSocket connection"""
-        if not self.state.closed:
-            await self.send({
-                "type": "websocket.close",
-                "code": code,
-                "reason": reason
-            })
-            self.state.closed = True
-            self.state.close_code = code
-            self.state.close_reason = reason
-            logger.info(f"WebSocket connection closed: {code} {reason}")
+        if not self._closed:
+            if code == 1000 and not reason:
+                message = _NORMAL_CLOSE
+            elif code == 1011 and reason == "Internal error":
+                message = _ERROR_CLOSE
+            else:
+                message = {"type": _CLOSE, "code": code, "reason": reason}
+            if self._outbox is not None:
+                self._queue_close(message)
+            else:
+                await self.send(message)
+            self._mark_closed(code, reason)
+
+    def _mark_closed(self, code: int, reason: str):
+        self._closed = self.state.closed = True
+        self.state.close_code = code
+        self.state.close_reason = reason
+        logger.info("WebSocket connection closed: %s %s", code, reason)
+
+    def _queue_close(self, message: Dict):
+        # Sent by the writer after the frames already queued; if the queue
+        # is full those are dropped so the close frame still fits
+        try:
+            self._outbox.put_nowait(message)
+        except asyncio.QueueFull:
+            self._clear_outbox()
+            self._outbox.put_nowait(message)
+
+    async def drain(self):
+        """Wait until every queued outbound frame has been handed to the server"""
+        if self._outbox is not None:
+            await self._outbox.join()
+
+    async def _flush(self):
+        """Drain the queue before the writer is stopped, giving up after ``drain_timeout``"""
+        if self._outbox is not None:
+            try:
+                await asyncio.wait_for(self.drain(), self.drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("WebSocket frames dropped: client did not read them in time")
+
+    async def _write(self, message: Dict):
+        if self._outbox is None:
+            await self.send(message)
+        elif not self._enqueue(message):
+            raise _WSClosed(1013, "Client too slow")
+
+    def _enqueue(self, message: Dict) -> bool:
+        """Queue a frame for the writer task; False once the client is given up on"""
+        try:
+            self._outbox.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            # The client isn't reading; give up on it rather than buffer forever
+            self._queue_close({"type": _CLOSE, "code": 1013, "reason": "Client too slow"})
+            self._mark_closed(1013, "Client too slow")
+            return False
+
+    def _start_writer(self):
+        """Route outbound frames through a queue drained by one writer task"""
+        if self._writer is None and not self._closed:
+            self._outbox = asyncio.Queue(self.outbox_size)
+            self._writer = asyncio.ensure_future(self._write_loop(self._outbox))
+
+    def _stop_writer(self):
+        if self._writer is not None:
+            self._writer.cancel()
+            self._writer = None
+            self._clear_outbox()
+            self._outbox = None
+
+    def _clear_outbox(self):
+        outbox = self._outbox
+        while not outbox.empty():
+            outbox.get_nowait()
+            outbox.task_done()
+
+    async def _write_loop(self, outbox: asyncio.Queue):
+        send = self.send
+        batch_size = self.write_batch_size
+        try:
+            while True:
+                # Take whatever has piled up in one go instead of one wakeup per frame
+                batch = [await outbox.get()]
+                while len(batch) < batch_size and not outbox.empty():
+                    batch.append(outbox.get_nowait())
+                try:
+                    for message in batch:
+                        await send(message)
+                        if message["type"] == _CLOSE:
+                            return
+                finally:
+                    # Every frame taken off the queue counts as done, sent or
+                    # not, so drain() can't wait on frames a failed, cancelled
+                    # or closed writer will never send
+                    for _ in batch:
+                        outbox.task_done()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._closed = self.state.closed = True
+            logger.warning("WebSocket writer stopped: %s", e)
+        finally:
+            if self._outbox is outbox:
+                self._writer = None
+                self._clear_outbox()
+                self._outbox = None
 
 class WebSocketRoute:
-    """Base class for WebSocket routes"""
-    encoding: str = "text"  # or "bytes" or "json"
+    """Base class for WebSocket routes
+
+    An unknown class-level ``encoding`` fails when the subclass is defined;
+    the receive method is looked up once per connection, so an encoding set
+    on the instance is honoured too.
+    """
+    __slots__ = ()
+    encoding: str = "text"  # or "bytes", "json" or "msgpack"
+
+    # encoding -> WebSocket receive method, resolved once per connection
+    _RECEIVERS: Dict[str, Callable[[WebSocket], Awaitable[Any]]] = {
+        "text": WebSocket.receive_text,
+        "bytes": WebSocket.receive_bytes,
+        "json": WebSocket.receive_json,
+        "msgpack": WebSocket.receive_msgpack,
+    }
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.encoding not in cls._RECEIVERS:
+            raise ValueError(f"Invalid encoding: {cls.encoding}")
 
     async def on_connect(self, websocket: WebSocket) -> bool:
         """Called when client connects. Return True to accept."""
@@ -144,69 +319,114 @@ class WebSocketRoute:
                 await websocket.close(1003, "Rejected")
                 return
 
-            # Main message loop
-            while True:
-                try:
-                    if self.encoding == "text":
-                        data = await websocket.receive_text()
-                    elif self.encoding == "bytes":
-                        data = await websocket.receive_bytes()
-                    elif self.encoding == "json":
-                        data = await websocket.receive_json()
-                    else:
-                        raise ValueError(f"Invalid encoding: {self.encoding}")
-                        
-                    await self.on_receive(websocket, data)
-                    
-                except websockets.ConnectionClosed:
-                    break
-                    
+            receive_data = self._RECEIVERS.get(self.encoding)
+            if receive_data is None:
+                raise ValueError(f"Invalid encoding: {self.encoding}")
+            on_receive = self.on_receive
+
+            # Main message loop; ends when the client disconnects. Frames are
+            # not batched: when the server already has frames buffered,
+            # awaiting receive() returns without suspending, so a burst is
+            # handled in one pass of the event loop as it is
+            try:
+                while True:
+                    await on_receive(websocket, await receive_data(websocket))
+            except _WSClosed:
+                pass
+
         except Exception as e:
-            logger.error(f"WebSocket error: {e}")
+            logger.error("WebSocket error: %s", e)
             if not websocket.state.closed:
                 await websocket.close(1011, "Internal error")
                 
         finally:
             if not websocket.state.closed:
                 await websocket.close()
+            # Frames queued for a pooled connection (including the close)
+            # go out before on_disconnect, which usually stops the writer
+            await websocket._flush()
             await self.on_disconnect(websocket, websocket.state.close_code or 1006)
 
 class WebSocketPool:
     """Manage multiple WebSocket connections"""
     def __init__(self):
-        self.active_connections: set[WebSocket] = set()
-        self._lock = asyncio.Lock()
+        # Only touched from the event loop and never across an await, so each
+        # update is atomic without a lock; broadcasts iterate a snapshot.
+        # Held weakly so a connection whose handler never called disconnect
+        # (an exception in user code) doesn't stay in the pool forever
+        self.active_connections: Set[WebSocket] = weakref.WeakSet()
 
     async def connect(self, websocket: WebSocket):
-        """Add a WebSocket connection to the pool"""
-        async with self._lock:
-            self.active_connections.add(websocket)
+        """Add a WebSocket connection to the pool
+
+        Pooled connections get a writer task: sends (and broadcasts) only
+        queue the frame, and each client is written to at its own pace.
+        """
+        self.active_connections.add(websocket)
+        websocket._start_writer()
 
     async def disconnect(self, websocket: WebSocket):
-        """Remove a WebSocket connection from the pool"""
-        async with self._lock:
-            self.active_connections.remove(websocket)
+        """Remove a WebSocket connection from the pool
+
+        Frames already queued are written first (up to
+        ``WebSocket.drain_timeout``); after a client disconnect there is
+        no queue left to drain.
+        """
+        self.active_connections.discard(websocket)
+        await websocket._flush()
+        websocket._stop_writer()
 
     async def broadcast_text(self, message: str):
         """Broadcast text message to all connections"""
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except websockets.ConnectionClosed:
-                await self.disconnect(connection)
+        await self._broadcast("text", message)
 
     async def broadcast_json(self, data: Any):
         """Broadcast JSON message to all connections"""
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(data)
-            except websockets.ConnectionClosed:
-                await self.disconnect(connection)
+        # Serialized once and shared by every connection
+        await self._broadcast("text", json_dumps(data).decode())
 
     async def broadcast_bytes(self, data: bytes):
         """Broadcast bytes message to all connections"""
-        for connection in self.active_connections:
-            try:
-                await connection.send_bytes(data)
-            except websockets.ConnectionClosed:
-                await self.disconnect(connection)
\ No newline at end of file
+        await self._broadcast("bytes", data)
+
+    async def _broadcast(self, key: str, payload: Any):
+        """Send a frame to every connection without letting a slow client hold up the rest
+
+        Pooled connections only get the frame queued for their writer task,
+        so the loop needs no per-connection await or try block; connections
+        found closed (or given up on as too slow) are collected and dropped
+        afterwards. Connections without a writer are sent to concurrently,
+        and any error other than a closed connection is re-raised once all
+        of those sends have finished.
+
+        One message dict is built per broadcast and handed to every
+        connection, so the payload is shared rather than copied; a custom
+        ASGI server must not mutate or keep the message after its send.
+        """
+        message = {"type": _SEND, key: payload}
+        dead = []
+        direct = []
+        for connection in list(self.active_connections):
+            if connection._closed:
+                dead.append(connection)
+            elif connection._outbox is None:
+                direct.append(connection)
+            elif not connection._enqueue(message):
+                dead.append(connection)
+
+        error = None
+        if direct:
+            results = await asyncio.gather(
+                *(connection._write(message) for connection in direct),
+                return_exceptions=True
+            )
+            for connection, result in zip(direct, results):
+                if isinstance(result, _WSClosed):
+                    dead.append(connection)
+                elif isinstance(result, Exception) and error is None:
+                    error = result
+
+        for connection in dead:
+            await self.disconnect(connection)
+        if error is not None:
+            raise error
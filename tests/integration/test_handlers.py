@@ -1,6 +1,6 @@
 """Integration tests for Keev framework"""
 import pytest
-from keev import Application, Router, JSONResponse, RequestContext, BaseMiddleware
+from keev import Application, Router, Request, JSONResponse, RequestContext, BaseMiddleware
 from keev.static import StaticFiles
 from pydantic import BaseModel
 import os
@@ -202,6 +202,73 @@ async def test_static_file_serving(static_app):
     assert body_messages
     assert b"<h1>Test Page</h1>" in body_messages[0]["body"]
 
+@pytest.mark.asyncio
+async def test_static_file_pathsend(static_app, monkeypatch):
+    """Test static files are handed to the server when it supports pathsend"""
+    # Only uncached files are sent from disk
+    monkeypatch.setattr(StaticFiles, "cache_max_file_size", 0)
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/static/index.html",
+        "headers": [],
+        "query_string": b"",
+        "asgi": {"version": "3.0"},
+        "extensions": {"http.response.pathsend": {}}
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    responses = []
+    async def send(message):
+        responses.append(message)
+
+    await static_app(scope, receive, send)
+
+    assert responses[0]["type"] == "http.response.start"
+    assert (b"content-length", b"18") in responses[0]["headers"]
+    assert responses[1]["type"] == "http.response.pathsend"
+    assert responses[1]["path"].endswith("index.html")
+
+@pytest.mark.asyncio
+async def test_static_file_traversal():
+    """Test paths escaping the static directory are rejected"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        static = StaticFiles(os.path.join(temp_dir, "public"))
+        with open(os.path.join(temp_dir, "secret.txt"), "w") as f:
+            f.write("secret")
+        os.makedirs(os.path.join(temp_dir, "public2"))
+        with open(os.path.join(temp_dir, "public2", "other.txt"), "w") as f:
+            f.write("other")
+
+        for path in ("../secret.txt", "/../secret.txt", "../public2/other.txt", "a/../../secret.txt", "."):
+            request = Request({"type": "http", "method": "GET", "path": "/static/" + path, "headers": []}, None)
+            request.path_params = {"path": path}
+            response = await static(request)
+            assert response.status_code == 404, path
+
+@pytest.mark.asyncio
+async def test_static_file_cache():
+    """Test small static files are cached until they change on disk"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        static = StaticFiles(temp_dir)
+        static.write_file("app.js", "console.log(1)")
+
+        request = Request({"type": "http", "method": "GET", "path": "/static/app.js", "headers": []}, None)
+        request.path_params = {"path": "app.js"}
+
+        first = await static(request)
+        assert first.content == b"console.log(1)"
+        assert (await static(request)).content is first.content
+
+        path = os.path.join(temp_dir, "app.js")
+        static.write_file("app.js", "console.log(22)")
+        os.utime(path, ns=(0, 0))
+        changed = await static(request)
+        assert changed.content == b"console.log(22)"
+        assert changed.headers["content-type"] in ("application/javascript", "text/javascript")
+
 @pytest.mark.asyncio
 async def test_error_handling(test_app):
     """Test error responses and status codes"""
@@ -245,4 +312,33 @@ async def test_error_handling(test_app):
     await test_app(scope, invalid_receive, send)
     
     # Verify 422 response for validation error
-    assert any(m["type"] == "http.response.start" and m["status"] == 422 for m in responses)
\ No newline at end of file
+    assert any(m["type"] == "http.response.start" and m["status"] == 422 for m in responses)
+
+@pytest.mark.asyncio
+async def test_msgpack_body_without_msgspec(test_app, monkeypatch):
+    """Test a MessagePack body is answered with 415 when msgspec is missing"""
+    import keev.utils
+
+    def missing():
+        raise ImportError("MessagePack support requires msgspec: pip install msgspec")
+
+    monkeypatch.setattr(keev.utils, "_msgpack_decoder", None)
+    monkeypatch.setattr(keev.utils, "_load_msgpack", missing)
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/items",
+        "headers": [(b"content-type", b"application/msgpack")],
+        "query_string": b"",
+        "asgi": {"version": "3.0"}
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"\x80", "more_body": False}
+
+    responses = []
+    async def send(message):
+        responses.append(message)
+
+    await test_app(scope, receive, send)
+    assert any(m["type"] == "http.response.start" and m["status"] == 415 for m in responses)
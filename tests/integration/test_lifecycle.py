@@ -1,7 +1,8 @@
 """Integration tests for application lifecycle and plugin system"""
 import pytest
+import asyncio
 from keev import Application, Router, JSONResponse
-from keev.plugins import Plugin
+from keev.plugins import Plugin, SecurityPlugin, MetricsPlugin
 from typing import List, Dict, Any
 
 class TestPlugin(Plugin):
@@ -126,6 +127,45 @@ async def test_multiple_plugins(app_with_plugins):
     await app_with_plugins.shutdown()
     assert plugin1.shutdown_called and plugin2.shutdown_called
 
+@pytest.mark.asyncio
+async def test_plugins_and_middleware_registered_directly(app_with_plugins):
+    """Test plugins and middleware added without the Application helpers"""
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [],
+        "query_string": b"",
+        "asgi": {"version": "3.0"}
+    }
+    
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    
+    messages = []
+    async def send(message):
+        messages.append(message)
+        
+    # Serve once first so the plugin-free pipeline has been chosen
+    await app_with_plugins(scope, receive, send)
+    
+    plugin = TestPlugin()
+    app_with_plugins.plugin_manager.register(plugin)
+    
+    async def tag(request, call_next):
+        response = await call_next(request)
+        response.headers["x-direct"] = "1"
+        return response
+    
+    app_with_plugins.middleware.append(tag)
+    
+    messages.clear()
+    await app_with_plugins(scope, receive, send)
+    
+    assert plugin.request_count == 1
+    start = next(m for m in messages if m["type"] == "http.response.start")
+    assert (b"x-direct", b"1") in start["headers"]
+
 @pytest.mark.asyncio
 async def test_plugin_disabled_by_default():
     """Test that plugins are disabled by default"""
@@ -154,4 +194,84 @@ async def test_application_events(app_with_plugins):
     assert startup_called
     
     await app_with_plugins.shutdown()
-    assert shutdown_called
\ No newline at end of file
+    assert shutdown_called
+
+@pytest.mark.asyncio
+async def test_security_plugin_headers(app_with_plugins):
+    """Test SecurityPlugin adds its headers to responses"""
+    app_with_plugins.register_plugin(SecurityPlugin())
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"host", b"testserver")],
+        "query_string": b"",
+        "asgi": {"version": "3.0"}
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    messages = []
+    async def send(message):
+        messages.append(message)
+
+    await app_with_plugins(scope, receive, send)
+
+    headers = dict(messages[0]["headers"])
+    assert headers[b"x-content-type-options"] == b"nosniff"
+    assert headers[b"x-frame-options"] == b"DENY"
+
+@pytest.mark.asyncio
+async def test_parallel_plugin_startup():
+    """Test parallel strategy overlaps plugin startup hooks"""
+    app = Application(enable_plugins=True, plugin_strategy="parallel")
+    app.router = Router()
+    events = []
+
+    class SlowPlugin(TestPlugin):
+        def __init__(self, name):
+            super().__init__()
+            self.name = name
+
+        async def on_startup(self):
+            events.append(f"{self.name} start")
+            await asyncio.sleep(0)
+            events.append(f"{self.name} done")
+
+    app.register_plugin(SlowPlugin("a"))
+    app.register_plugin(SlowPlugin("b"))
+    await app.startup()
+
+    assert events[:2] == ["a start", "b start"]
+
+@pytest.mark.asyncio
+async def test_metrics_plugin_stats(app_with_plugins):
+    """Test MetricsPlugin aggregates per-path timings"""
+    plugin = MetricsPlugin()
+    app_with_plugins.register_plugin(plugin)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [],
+        "query_string": b"",
+        "asgi": {"version": "3.0"}
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(3):
+        await app_with_plugins(scope, receive, send)
+
+    stats = plugin.get_stats("/")
+    assert plugin.request_count == 3
+    assert stats["count"] == 3
+    assert stats["min"] <= stats["mean"] <= stats["max"]
+    assert plugin.get_stats("/missing") is None
@@ -4,6 +4,7 @@ import json
 import orjson
 from keev import Application, Router, Request, JSONResponse, RequestContext, BaseMiddleware
 from pydantic import BaseModel
+from typing import Annotated, List, Optional
 
 class Item(BaseModel):
     name: str
@@ -210,6 +211,78 @@ async def test_middleware(app):
     headers = dict(start_messages[0]["headers"])
     assert headers[b"x-test"] == b"test"
 
+@pytest.mark.asyncio
+async def test_middleware_wraps_router(app):
+    """Test middleware runs around the router and can short-circuit it"""
+    calls = []
+
+    class Outer(BaseMiddleware):
+        async def __call__(self, request, call_next):
+            calls.append("outer")
+            return await call_next(request)
+
+    class Gate(BaseMiddleware):
+        async def __call__(self, request, call_next):
+            calls.append("gate")
+            if request.path == "/blocked":
+                return JSONResponse({"error": "blocked"}, status_code=403)
+            return await call_next(request)
+
+    app.add_middleware(Outer())
+    app.add_middleware(Gate())
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    for path, status in (("/", 200), ("/blocked", 403)):
+        scope = {
+            "type": "http", "method": "GET", "path": path,
+            "headers": [], "query_string": b"",
+            "server": ("testserver", 80), "client": None,
+            "scheme": "http", "root_path": "", "raw_path": path.encode(),
+            "asgi": {"version": "3.0"}
+        }
+        responses = []
+        async def send(message):
+            responses.append(message)
+
+        await app(scope, receive, send)
+        assert responses[0]["status"] == status
+
+    assert calls == ["outer", "gate", "outer", "gate"]
+
+@pytest.mark.asyncio
+async def test_function_middleware(app):
+    """Test plain async functions can be registered as middleware"""
+    async def add_header(request, call_next):
+        response = await call_next(request)
+        response.add_header("x-function", "yes")
+        return response
+
+    app.add_middleware(add_header)
+    with pytest.raises(TypeError):
+        app.add_middleware("not middleware")
+
+    scope = {
+        "type": "http", "method": "GET", "path": "/",
+        "headers": [], "query_string": b"",
+        "server": ("testserver", 80), "client": None,
+        "scheme": "http", "root_path": "", "raw_path": b"/",
+        "asgi": {"version": "3.0"}
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    responses = []
+    async def send(message):
+        responses.append(message)
+
+    await app(scope, receive, send)
+    headers = dict(responses[0]["headers"])
+    assert headers[b"x-function"] == b"yes"
+    assert headers[b"x-test"] == b"test"
+
 @pytest.mark.asyncio
 async def test_static_files(app):
     """Test static file serving"""
@@ -220,4 +293,193 @@ async def test_static_files(app):
 async def test_application_startup_shutdown(app):
     """Test application lifecycle events"""
     # Lifecycle tests remain unchanged...
-    pass
\ No newline at end of file
+    pass
+
+@pytest.mark.asyncio
+async def test_route_lookup():
+    """Test static, dynamic and method-mismatch route resolution"""
+    app = Application(enable_plugins=False)
+    router = Router()
+
+    @router.get("/users/{user_id}")
+    async def get_user(user_id: int):
+        return JSONResponse({"id": user_id})
+
+    @router.get("/users/{username}/profile")
+    async def get_profile(username: str):
+        return JSONResponse({"profile": username})
+
+    @router.get("/users/{username}")
+    async def get_user_by_name(username: str):
+        return JSONResponse({"name": username})
+
+    @router.post("/users")
+    async def create_user():
+        return JSONResponse({"created": True}, status_code=201)
+
+    @router.get("/flags/{enabled}")
+    async def get_flag(enabled: bool):
+        return JSONResponse({"enabled": enabled})
+
+    # Non-class annotations are never mistaken for body models
+    @router.get("/search")
+    async def search(request: Request, limit: Optional[int] = None, tags: List[str] = None):
+        return JSONResponse({"limit": limit, "tags": tags})
+
+    # String annotations, as under "from __future__ import annotations"
+    @router.get("/orders/{order_id}")
+    async def get_order(order_id: "int") -> "JSONResponse":
+        return JSONResponse({"order": order_id})
+
+    # Annotated metadata is stripped, leaving the underlying converter
+    @router.get("/items/{item_id}")
+    async def get_item(item_id: Annotated[int, "item id"]):
+        return JSONResponse({"item": item_id})
+
+    @router.get("/files/{file_id}.txt")
+    async def get_numbered_file(file_id: int):
+        return JSONResponse({"file_id": file_id})
+
+    @router.get("/files/{name}.txt")
+    async def get_text_file(name: str):
+        return JSONResponse({"file": name})
+
+    @router.get("/files/{name}.json")
+    async def get_json_file(name: str):
+        return JSONResponse({"json": name})
+
+    # Overlapping patterns resolve in registration order, not by specificity
+    @router.get("/tree/{x}/c")
+    async def get_tree_param_first(x: str):
+        return JSONResponse({"first": x})
+
+    @router.get("/tree/b/{y}")
+    async def get_tree_literal_second(y: str):
+        return JSONResponse({"second": y})
+
+    @router.get("/pages/{slug}")
+    async def get_page(slug: str):
+        return JSONResponse({"page": slug})
+
+    @router.get("/pages/about")
+    async def get_about():
+        return JSONResponse({"about": True})
+
+    app.router = router
+
+    async def call(method, path):
+        scope = {
+            "type": "http", "method": method, "path": path,
+            "headers": [], "query_string": b"",
+            "server": ("testserver", 80), "client": None,
+            "scheme": "http", "root_path": "",
+            "raw_path": path.encode(), "asgi": {"version": "3.0"}
+        }
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        responses = []
+        async def send(message):
+            responses.append(message)
+
+        await app(scope, receive, send)
+        start = next(m for m in responses if m["type"] == "http.response.start")
+        body = next(m for m in responses if m["type"] == "http.response.body")
+        return start, json.loads(body["body"])
+
+    start, body = await call("GET", "/users/7")
+    assert start["status"] == 200 and body == {"id": 7}
+
+    # A failed int conversion falls through to the next matching route
+    start, body = await call("GET", "/users/alice")
+    assert start["status"] == 200 and body == {"name": "alice"}
+
+    start, body = await call("GET", "/users/alice/profile/")
+    assert start["status"] == 200 and body == {"profile": "alice"}
+
+    start, body = await call("POST", "/users/")
+    assert start["status"] == 201
+
+    # Partial-segment parameters are resolved by the regex fallback
+    start, body = await call("GET", "/files/notes.txt")
+    assert start["status"] == 200 and body == {"file": "notes"}
+
+    start, body = await call("GET", "/flags/on")
+    assert start["status"] == 200 and body == {"enabled": True}
+
+    start, body = await call("GET", "/flags/0")
+    assert start["status"] == 200 and body == {"enabled": False}
+
+    start, body = await call("GET", "/flags/maybe")
+    assert start["status"] == 404
+
+    start, body = await call("GET", "/search")
+    assert start["status"] == 200 and body == {"limit": None, "tags": None}
+
+    start, body = await call("GET", "/orders/12")
+    assert start["status"] == 200 and body == {"order": 12}
+
+    start, body = await call("GET", "/items/5")
+    assert start["status"] == 200 and body == {"item": 5}
+
+    start, body = await call("GET", "/files/3.txt")
+    assert start["status"] == 200 and body == {"file_id": 3}
+
+    start, body = await call("GET", "/files/notes.json")
+    assert start["status"] == 200 and body == {"json": "notes"}
+
+    start, body = await call("GET", "/users//profile")
+    assert start["status"] == 404
+
+    start, body = await call("GET", "/tree/b/c")
+    assert start["status"] == 200 and body == {"first": "b"}
+
+    start, body = await call("GET", "/tree/b/d")
+    assert start["status"] == 200 and body == {"second": "d"}
+
+    start, body = await call("GET", "/pages/about")
+    assert start["status"] == 200 and body == {"page": "about"}
+
+    start, body = await call("GET", "/users")
+    assert start["status"] == 405
+    assert (b"allow", b"POST") in start["headers"]
+
+@pytest.mark.asyncio
+async def test_depends_cached_per_request():
+    """Test dependencies resolve once per request and not across requests"""
+    from keev import Depends
+
+    calls = []
+
+    async def get_user(request):
+        calls.append(request)
+        return request.path
+
+    user = Depends(get_user)
+
+    def get_greeting(name=user, again=user):
+        return f"hello {name}"
+
+    greeting = Depends(get_greeting)
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    first = Request({"type": "http", "method": "GET", "path": "/a", "headers": []}, receive)
+    second = Request({"type": "http", "method": "GET", "path": "/b", "headers": []}, receive)
+
+    assert await greeting(first) == "hello /a"
+    assert await user(first) == "/a"
+    assert await greeting(second) == "hello /b"
+    assert calls == [first, second]
+
+def test_request_accepts_custom_attributes():
+    """Middleware and plugins can still attach attributes to a request"""
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": []}, receive)
+    request.user = "alice"
+    assert request.user == "alice"
+    assert request.path == "/"
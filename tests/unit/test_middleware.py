@@ -1,6 +1,6 @@
 """Unit tests for middleware functionality"""
 import pytest
-from keev.middleware import BaseMiddleware, CORSMiddleware
+from keev.middleware import BaseMiddleware, CORSMiddleware, ProfilerMiddleware
 from keev.responses import Response, JSONResponse
 from keev.requests import Request
 
@@ -89,4 +89,93 @@ async def test_cors_middleware_custom_origins():
         return JSONResponse({"status": "ok"})
     
     response = await middleware(request, next_handler)
-    assert response.headers["access-control-allow-origin"] == "http://localhost:8000"
\ No newline at end of file
+    assert response.headers["access-control-allow-origin"] == "http://localhost:8000"
+
+@pytest.mark.asyncio
+async def test_cors_preflight_skips_handler():
+    """Test CORS preflight requests are answered without calling the handler"""
+    middleware = CORSMiddleware()
+    scope = {
+        "type": "http",
+        "method": "OPTIONS",
+        "path": "/test",
+        "headers": [
+            (b"origin", b"http://localhost:8000"),
+            (b"access-control-request-method", b"POST"),
+        ],
+    }
+    request = Request(scope, lambda: {"type": "http.request", "body": b""})
+
+    async def next_handler(request):
+        raise AssertionError("preflight reached the handler")
+
+    response = await middleware(request, next_handler)
+    assert response.status_code == 204
+    assert response.headers["access-control-max-age"] == "3600"
+
+@pytest.mark.asyncio
+async def test_cors_plain_options_reaches_handler():
+    """Test OPTIONS requests that aren't preflights go to the application"""
+    middleware = CORSMiddleware(allow_origins=["http://localhost:8000"])
+    request = Request({"type": "http", "method": "OPTIONS", "path": "/test", "headers": []},
+                      lambda: {"type": "http.request", "body": b""})
+
+    async def next_handler(request):
+        return JSONResponse({"options": True})
+
+    response = await middleware(request, next_handler)
+    assert response.status_code == 200
+    assert "access-control-allow-origin" not in response.headers
+
+@pytest.mark.asyncio
+async def test_cors_preflight_unlisted_origin():
+    """Test a preflight from an origin outside the allow-list isn't granted"""
+    middleware = CORSMiddleware(allow_origins=["http://localhost:8000"])
+    scope = {
+        "type": "http",
+        "method": "OPTIONS",
+        "path": "/test",
+        "headers": [
+            (b"origin", b"http://evil.example"),
+            (b"access-control-request-method", b"POST"),
+        ],
+    }
+    request = Request(scope, lambda: {"type": "http.request", "body": b""})
+
+    async def next_handler(request):
+        raise AssertionError("preflight reached the handler")
+
+    response = await middleware(request, next_handler)
+    assert response.status_code == 204
+    assert "access-control-allow-origin" not in response.headers
+
+@pytest.mark.asyncio
+async def test_profiler_middleware_disabled(mock_request):
+    """Test profiler middleware is a passthrough unless enabled"""
+    middleware = ProfilerMiddleware(enabled=False)
+    
+    async def next_handler(request):
+        return JSONResponse({"status": "ok"})
+    
+    response = await middleware(mock_request, next_handler)
+    assert response.headers["content-type"] == "application/json"
+
+@pytest.mark.asyncio
+async def test_profiler_middleware_profiles_request():
+    """Test profiler middleware returns an HTML report for ?profile=1"""
+    pytest.importorskip("pyinstrument")
+    middleware = ProfilerMiddleware(enabled=True)
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/test",
+        "headers": [],
+        "query_string": b"profile=1",
+    }
+    request = Request(scope, lambda: {"type": "http.request", "body": b""})
+    
+    async def next_handler(request):
+        return JSONResponse({"status": "ok"})
+    
+    response = await middleware(request, next_handler)
+    assert response.headers["content-type"] == "text/html"
@@ -1,7 +1,7 @@
 """Unit tests for request and response handling"""
 import pytest
 from keev.requests import Request
-from keev.responses import JSONResponse, HTMLResponse, Response
+from keev.responses import JSONResponse, HTMLResponse, MsgPackResponse, Response, StreamingJSONResponse
 import json
 
 @pytest.fixture
@@ -26,6 +26,8 @@ async def test_request_headers(mock_scope):
     request = Request(mock_scope, receive)
     assert request.headers["content-type"] == "application/json"
     assert request.headers["x-test-header"] == "test-value"
+    assert request.headers["Content-Type"] == "application/json"
+    assert request.headers.get("missing") is None
 
 @pytest.mark.asyncio
 async def test_request_query_params(mock_scope):
@@ -36,6 +38,9 @@ async def test_request_query_params(mock_scope):
     request = Request(mock_scope, receive)
     assert request.query_params["key"] == ["value"]
 
+    scope = {**mock_scope, "query_string": b"tag=a&tag=b+c&q=%E2%82%AC&empty=&flag"}
+    assert Request(scope, receive).query_params == {"tag": ["a", "b c"], "q": ["\u20ac"]}
+
 @pytest.mark.asyncio
 async def test_json_request_body():
     """Test JSON request body parsing"""
@@ -57,6 +62,23 @@ async def test_json_request_body():
     request = Request(scope, receive)
     body = await request.json()
     assert body == test_data
+    assert await request.json() is body
+
+@pytest.mark.asyncio
+async def test_chunked_request_body():
+    """Test request bodies split across several ASGI messages"""
+    chunks = iter([
+        {"type": "http.request", "body": b"hello ", "more_body": True},
+        {"type": "http.request", "body": b"chunked", "more_body": True},
+        {"type": "http.request", "body": b" world", "more_body": False},
+    ])
+
+    async def receive():
+        return next(chunks)
+
+    request = Request({"type": "http", "headers": []}, receive)
+    assert await request.body() == b"hello chunked world"
+    assert await request.body() == b"hello chunked world"
 
 @pytest.mark.asyncio
 async def test_json_response():
@@ -98,6 +120,35 @@ async def test_response_headers():
     assert response.headers["x-custom"] == "value"
     assert response.headers["content-type"] == "text/plain"
 
+    # Changes made through the mapping are what gets sent
+    response.headers["X-Added"] = 1
+    del response.headers["x-custom"]
+    assert (b"x-added", b"1") in response._prepare_headers()
+    assert (b"x-custom", b"value") not in response._prepare_headers()
+
+@pytest.mark.asyncio
+async def test_response_body_reused_until_content_changes():
+    """Test a resent response reuses its encoded body until content is reassigned"""
+    response = HTMLResponse("<p>one</p>")
+    bodies = []
+    async def send(message):
+        if message["type"] == "http.response.body":
+            bodies.append(message["body"])
+
+    await response(None, None, send)
+    await response(None, None, send)
+    response.content = "<p>two</p>"
+    await response(None, None, send)
+    assert bodies == [b"<p>one</p>", b"<p>one</p>", b"<p>two</p>"]
+    assert bodies[0] is bodies[1]
+
+    response = JSONResponse({"n": 1})
+    bodies.clear()
+    await response(None, None, send)
+    await response(None, None, send)
+    assert bodies[0] is bodies[1]
+    assert json.loads(bodies[0]) == {"n": 1}
+
 @pytest.mark.asyncio
 async def test_response_send():
     """Test response sending through ASGI interface"""
@@ -122,4 +173,79 @@ async def test_response_send():
         m["type"] == "http.response.body" and
         json.loads(m["body"]) == {"test": "value"}
         for m in messages
-    )
\ No newline at end of file
+    )
+
+@pytest.mark.asyncio
+async def test_streaming_json_response():
+    """Test streaming an iterable of rows as a JSON array"""
+    rows = [{"id": i, "name": f"item-{i}"} for i in range(100)]
+    response = StreamingJSONResponse(iter(rows))
+    response.chunk_size = 64
+
+    messages = []
+    async def send(message):
+        messages.append(message)
+
+    await response(None, None, send)
+
+    assert (b"content-type", b"application/json") in messages[0]["headers"]
+    bodies = [m for m in messages if m["type"] == "http.response.body"]
+    assert len(bodies) > 2
+    assert bodies[-1]["more_body"] is False
+    assert json.loads(b"".join(m["body"] for m in bodies)) == rows
+
+    empty = StreamingJSONResponse([])
+    messages.clear()
+    await empty(None, None, send)
+    assert b"".join(m["body"] for m in messages[1:]) == b"[]"
+
+@pytest.mark.asyncio
+async def test_msgpack_response():
+    """Test MessagePack responses and request bodies"""
+    msgpack = pytest.importorskip("msgspec.msgpack")
+    data = {"id": 1, "tags": ["a", "b"]}
+    response = MsgPackResponse(data)
+
+    messages = []
+    async def send(message):
+        messages.append(message)
+
+    await response({}, None, send)
+    assert (b"content-type", b"application/msgpack") in messages[0]["headers"]
+    assert msgpack.decode(messages[1]["body"]) == data
+
+    async def receive():
+        return {"type": "http.request", "body": messages[1]["body"], "more_body": False}
+
+    request = Request({"type": "http", "headers": []}, receive)
+    assert await request.msgpack() == data
+
+@pytest.mark.asyncio
+async def test_streaming_response_coalesces_chunks():
+    """Test small streamed chunks are batched into fewer body messages"""
+    from keev.responses import StreamingResponse
+
+    async def lines():
+        for i in range(100):
+            yield f"line {i}\n"
+
+    response = StreamingResponse(lines(), media_type="text/plain")
+    response.chunk_size = 256
+
+    messages = []
+    async def send(message):
+        messages.append(message)
+
+    await response({}, None, send)
+    bodies = [m for m in messages if m["type"] == "http.response.body"]
+    assert b"".join(m["body"] for m in bodies) == "".join(f"line {i}\n" for i in range(100)).encode()
+    assert len(bodies) < 10
+    assert all(len(m["body"]) >= 256 for m in bodies[:-1])
+    assert bodies[-1]["more_body"] is False
+
+    # Without a chunk_size every chunk goes out as soon as it is produced
+    response = StreamingResponse(lines(), media_type="text/plain")
+    messages.clear()
+    await response({}, None, send)
+    bodies = [m for m in messages if m["type"] == "http.response.body" and m["body"]]
+    assert len(bodies) == 100
@@ -0,0 +1,271 @@
+"""Unit tests for WebSocket connections and pools"""
+import pytest
+import asyncio
+import orjson
+from keev.websocket import ConnectionClosed, WebSocket, WebSocketPool, WebSocketRoute
+
+def make_websocket(sent, delay=0.0):
+    async def receive():
+        return {"type": "websocket.disconnect", "code": 1000}
+
+    async def send(message):
+        await asyncio.sleep(delay)
+        sent.append(message)
+
+    return WebSocket({"type": "websocket", "path": "/ws"}, receive, send)
+
+@pytest.mark.asyncio
+async def test_websocket_json_roundtrip():
+    """Test JSON frames are encoded and decoded"""
+    sent = []
+
+    async def receive():
+        return {"type": "websocket.receive", "text": '{"a": [1, 2]}'}
+
+    async def send(message):
+        sent.append(message)
+
+    websocket = WebSocket({"type": "websocket"}, receive, send)
+    assert await websocket.receive_json() == {"a": [1, 2]}
+    await websocket.send_json({"b": True})
+    assert orjson.loads(sent[0]["text"]) == {"b": True}
+
+@pytest.mark.asyncio
+async def test_pool_broadcast():
+    """Test broadcasts reach every connection"""
+    pool = WebSocketPool()
+    fast, slow = [], []
+    for websocket in (make_websocket(fast), make_websocket(slow, delay=0.01)):
+        await pool.connect(websocket)
+
+    await pool.broadcast_json({"event": "tick"})
+    await pool.broadcast_bytes(b"\x00")
+    for websocket in list(pool.active_connections):
+        await websocket.drain()
+
+    assert [m.get("text", m.get("bytes")) for m in fast] == ['{"event":"tick"}', b"\x00"]
+    assert [m.get("text", m.get("bytes")) for m in slow] == ['{"event":"tick"}', b"\x00"]
+
+@pytest.mark.asyncio
+async def test_pooled_writer_keeps_frame_order():
+    """Test queued frames are written in order and the close frame comes last"""
+    pool = WebSocketPool()
+    sent = []
+    websocket = make_websocket(sent)
+    await pool.connect(websocket)
+
+    for i in range(50):
+        await websocket.send_text(str(i))
+    await websocket.close()
+    await websocket.drain()
+
+    assert [m["text"] for m in sent[:-1]] == [str(i) for i in range(50)]
+    assert sent[-1] == {"type": "websocket.close", "code": 1000, "reason": ""}
+
+@pytest.mark.asyncio
+async def test_disconnect_is_a_websockets_connection_closed():
+    """Test handlers written against websockets.ConnectionClosed still catch disconnects"""
+    websockets = pytest.importorskip("websockets")
+    websocket = make_websocket([])
+
+    with pytest.raises(websockets.ConnectionClosed) as exc_info:
+        await websocket.receive_text()
+    assert exc_info.value.code == 1000
+    assert exc_info.value.reason == ""
+
+@pytest.mark.asyncio
+async def test_pool_broadcast_drops_closed_connections():
+    """Test closed connections are pruned from the pool on broadcast"""
+    pool = WebSocketPool()
+    sent = []
+    websocket = make_websocket(sent)
+    await pool.connect(websocket)
+    await websocket.close()
+
+    with pytest.raises(ConnectionClosed):
+        await websocket.send_text("late")
+    await pool.broadcast_text("hello")
+    assert websocket not in pool.active_connections
+
+@pytest.mark.asyncio
+async def test_websocket_route_json():
+    """Test a JSON route echoes frames until the client disconnects"""
+    frames = [
+        {"type": "websocket.connect"},
+        {"type": "websocket.receive", "text": '{"n": 1}'},
+        {"type": "websocket.receive", "text": '{"n": 2}'},
+        {"type": "websocket.disconnect", "code": 1001},
+    ]
+    disconnects = []
+
+    class Echo(WebSocketRoute):
+        encoding = "json"
+
+        async def on_connect(self, websocket):
+            await websocket.receive()
+            return True
+
+        async def on_receive(self, websocket, data):
+            await websocket.send_json({"echo": data["n"]})
+
+        async def on_disconnect(self, websocket, close_code):
+            disconnects.append(close_code)
+
+    async def receive():
+        return frames.pop(0)
+
+    sent = []
+    async def send(message):
+        sent.append(message)
+
+    await Echo()({"type": "websocket", "path": "/ws"}, receive, send)
+    assert sent[0]["type"] == "websocket.accept"
+    assert [orjson.loads(m["text"]) for m in sent[1:]] == [{"echo": 1}, {"echo": 2}]
+    assert disconnects == [1001]
+
+def test_websocket_route_rejects_unknown_encoding():
+    """Test a route subclass with an unknown encoding fails at definition"""
+    with pytest.raises(ValueError):
+        class Broken(WebSocketRoute):
+            encoding = "xml"
+
+@pytest.mark.asyncio
+async def test_pool_broadcast_gives_up_on_slow_client(monkeypatch):
+    """Test a client whose queue fills up is closed with 1013 and dropped"""
+    monkeypatch.setattr(WebSocket, "outbox_size", 2)
+    pool = WebSocketPool()
+    sent = []
+    websocket = make_websocket(sent, delay=0.01)
+    await pool.connect(websocket)
+
+    for i in range(3):
+        await pool.broadcast_text(str(i))
+    assert websocket not in pool.active_connections
+    assert websocket.state.close_code == 1013
+
+@pytest.mark.asyncio
+async def test_pool_releases_forgotten_connections():
+    """Test a connection dropped without disconnect leaves the pool"""
+    import gc
+    pool = WebSocketPool()
+    websocket = make_websocket([])
+    await pool.connect(websocket)
+    await websocket.close()
+    await websocket.drain()
+    await asyncio.sleep(0)  # let the writer task finish
+    assert len(pool.active_connections) == 1
+
+    del websocket
+    gc.collect()
+    assert len(pool.active_connections) == 0
+
+@pytest.mark.asyncio
+async def test_send_prepared_json():
+    """Test pre-encoded JSON is sent as is"""
+    sent = []
+    websocket = make_websocket(sent)
+    await websocket.send_json(b'{"cached":1}')
+    await websocket.send_prepared_json('{"cached":2}')
+    await websocket.send_json("text")
+    assert [m["text"] for m in sent] == ['{"cached":1}', '{"cached":2}', '"text"']
+
+@pytest.mark.asyncio
+async def test_websocket_msgpack_roundtrip():
+    """Test MessagePack frames are sent and received as bytes"""
+    pytest.importorskip("msgspec")
+    from keev.utils import msgpack_dumps
+
+    async def receive():
+        return {"type": "websocket.receive", "bytes": msgpack_dumps({"a": [1, 2]})}
+
+    sent = []
+    async def send(message):
+        sent.append(message)
+
+    websocket = WebSocket({"type": "websocket"}, receive, send)
+    assert await websocket.receive_msgpack() == {"a": [1, 2]}
+    await websocket.send_msgpack({"b": 1.5})
+    assert sent[0]["bytes"] == msgpack_dumps({"b": 1.5})
+
+@pytest.mark.asyncio
+async def test_pooled_frames_sent_before_disconnect():
+    """Test frames queued just before a handler fails still reach the server"""
+    pool = WebSocketPool()
+    frames = [
+        {"type": "websocket.connect"},
+        {"type": "websocket.receive", "text": "hi"},
+    ]
+
+    class Failing(WebSocketRoute):
+        async def on_connect(self, websocket):
+            await websocket.receive()
+            await pool.connect(websocket)
+            return True
+
+        async def on_receive(self, websocket, data):
+            await websocket.send_text("bye")
+            raise RuntimeError("boom")
+
+        async def on_disconnect(self, websocket, close_code):
+            await pool.disconnect(websocket)
+
+    async def receive():
+        return frames.pop(0)
+
+    sent = []
+    async def send(message):
+        await asyncio.sleep(0)
+        sent.append(message)
+
+    await Failing()({"type": "websocket", "path": "/ws"}, receive, send)
+    assert sent[0]["type"] == "websocket.accept"
+    assert sent[1] == {"type": "websocket.send", "text": "bye"}
+    assert sent[2] == {"type": "websocket.close", "code": 1011, "reason": "Internal error"}
+
+@pytest.mark.asyncio
+async def test_websocket_route_instance_encoding():
+    """Test an encoding set on the instance selects the receive method"""
+    frames = [
+        {"type": "websocket.receive", "text": '{"a": 1}'},
+        {"type": "websocket.disconnect", "code": 1000},
+    ]
+    received = []
+
+    class Configurable(WebSocketRoute):
+        def __init__(self, encoding):
+            self.encoding = encoding
+
+        async def on_receive(self, websocket, data):
+            received.append(data)
+
+    async def receive():
+        return frames.pop(0)
+
+    async def send(message):
+        pass
+
+    await Configurable("json")({"type": "websocket", "path": "/ws"}, receive, send)
+    assert received == [{"a": 1}]
+
+@pytest.mark.asyncio
+async def test_drain_returns_when_send_fails_mid_batch():
+    """Test a writer failing partway through a batch doesn't leave drain() waiting"""
+    sent = []
+
+    async def receive():
+        return {"type": "websocket.disconnect", "code": 1000}
+
+    async def send(message):
+        await asyncio.sleep(0)
+        if sent:
+            raise RuntimeError("connection lost")
+        sent.append(message)
+
+    websocket = WebSocket({"type": "websocket", "path": "/ws"}, receive, send)
+    await WebSocketPool().connect(websocket)
+    for i in range(5):
+        await websocket.send_text(str(i))
+
+    await asyncio.wait_for(websocket.drain(), 1)
+    assert [m["text"] for m in sent] == ["0"]
+    assert websocket.state.closed